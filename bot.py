@@ -16,112 +16,116 @@ Deploy to Pipecat Cloud:
     uv run pcc deploy
 """
 
+from __future__ import annotations
+
 import os
-import json
+import re
+import sys
+import time
 import asyncio
-from typing import Dict, List, Any
-from datetime import datetime
+from dataclasses import dataclass, field
+from functools import lru_cache
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
 from loguru import logger
 
-print("🤖 Starting Pipecat Agent Builder...")
-print("⏳ Loading models and imports (20 seconds, first run only)\n")
-
-logger.info("Loading Local Smart Turn Analyzer V3...")
-from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
-
-logger.info("✅ Local Smart Turn Analyzer V3 loaded")
-logger.info("Loading Silero VAD model...")
-from pipecat.audio.vad.silero import SileroVADAnalyzer
-
-logger.info("✅ Silero VAD model loaded")
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick is optional; keyword detection falls back to a regex scan
+    ahocorasick = None
 
-from pipecat.audio.vad.vad_analyzer import VADParams
-from pipecat.frames.frames import LLMRunFrame, TextFrame
-
-logger.info("Loading pipeline components...")
-from pipecat.pipeline.pipeline import Pipeline
-from pipecat.pipeline.runner import PipelineRunner
-from pipecat.pipeline.task import PipelineParams, PipelineTask
-from pipecat.processors.aggregators.llm_context import LLMContext
-from pipecat.processors.aggregators.llm_response_universal import LLMContextAggregatorPair
-from pipecat.processors.frameworks.rtvi import RTVIConfig, RTVIObserver, RTVIProcessor
-from pipecat.runner.types import RunnerArguments
-from pipecat.runner.utils import create_transport
-from pipecat.services.cartesia.tts import CartesiaTTSService
-from pipecat.services.deepgram.stt import DeepgramSTTService
-from pipecat.services.openai.llm import OpenAILLMService
-from pipecat.transports.base_transport import BaseTransport, TransportParams
-from pipecat.transports.daily.transport import DailyParams
-
-logger.info("✅ All components loaded successfully!")
+# Pipecat components (and the VAD / turn models behind them) are imported
+# inside bot() and run_bot(), so importing this module stays cheap.
+if TYPE_CHECKING:
+    from pipecat.runner.types import RunnerArguments
+    from pipecat.transports.base_transport import BaseTransport
 
 load_dotenv(override=True)
 
 
-class AgentBuilderState:
-    """Manages the conversation state for building agents."""
-    
-    def __init__(self):
-        self.requirements = {}
-        self.conversation_stage = "greeting"
-        self.agent_type = None
-        self.collected_info = {
-            "use_case": None,
-            "channels": [],
-            "languages": [],
-            "personality": None,
-            "integrations": [],
-            "special_features": []
-        }
-    
-    def update_requirements(self, key: str, value: Any):
-        """Update agent requirements based on user input."""
-        self.collected_info[key] = value
-        logger.info(f"Updated {key}: {value}")
-    
-    def get_completion_status(self) -> float:
-        """Return percentage of requirements collected."""
-        required_fields = ["use_case", "channels", "personality"]
-        completed = sum(1 for field in required_fields if self.collected_info.get(field))
-        return completed / len(required_fields)
-    
-    def is_ready_to_generate(self) -> bool:
-        """Check if we have enough info to generate an agent."""
-        return self.get_completion_status() >= 0.8
+@dataclass(frozen=True, slots=True)
+class _ServiceKeys:
+    """API keys for the speech and language services."""
+    deepgram: str
+    cartesia: str
+    openai: str
 
 
-class AgentCodeGenerator:
-    """Generates complete Pipecat agent code based on requirements."""
-    
-    def __init__(self, openai_service):
-        self.openai_service = openai_service
-    
-    async def generate_agent_code(self, requirements: Dict) -> Dict[str, str]:
-        """Generate complete Pipecat agent code files."""
-        
-        # Create detailed prompt for code generation
-        prompt = self._create_generation_prompt(requirements)
-        
-        # Generate the code using OpenAI
-        response = await self._call_openai_for_generation(prompt)
-        
-        # Parse the response into separate files
-        return self._parse_generated_code(response, requirements)
-    
-    def _create_generation_prompt(self, requirements: Dict) -> str:
-        """Create a detailed prompt for agent generation."""
-        return f"""
+@lru_cache(maxsize=1)
+def _service_keys() -> _ServiceKeys:
+    """Read the service API keys once, raising KeyError if one is missing."""
+    return _ServiceKeys(
+        deepgram=os.environ["DEEPGRAM_API_KEY"],
+        cartesia=os.environ["CARTESIA_API_KEY"],
+        openai=os.environ["OPENAI_API_KEY"],
+    )
+
+# A "FILE: <name>" line in generated output, including its line break
+_FILE_MARKER = re.compile(r'^FILE: (.*)$\n?', re.MULTILINE)
+
+# Keywords that mark each detected requirement value, checked as substrings
+_KEYWORD_GROUPS = {
+    "customer_service": ("customer service", "support", "help desk"),
+    "sales": ("sales", "lead", "prospect"),
+    "restaurant": ("restaurant", "reservation", "booking"),
+    "phone": ("phone",),
+    "web": ("web", "website", "browser"),
+    "mobile": ("mobile",),
+    "spanish": ("spanish",),
+    "french": ("french",),
+    "english": ("english",),
+    "friendly": ("friendly", "warm", "casual"),
+    "professional": ("professional", "formal", "business"),
+}
+
+# Fallback scanner: one named group per value. The lookahead reports a match
+# at every position, so keywords may overlap as they could with plain
+# substring checks.
+_REQUIREMENT_KEYWORDS = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{group}>{'|'.join(map(re.escape, words))})"
+        for group, words in _KEYWORD_GROUPS.items()
+    ) + ")",
+    re.IGNORECASE,
+)
+
+if ahocorasick is not None:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _group, _words in _KEYWORD_GROUPS.items():
+        for _word in _words:
+            _KEYWORD_AUTOMATON.add_word(_word, _group)
+    _KEYWORD_AUTOMATON.make_automaton()
+    del _group, _words, _word
+else:
+    _KEYWORD_AUTOMATON = None
+
+
+@lru_cache(maxsize=256)
+def _find_requirement_keywords(text: str) -> frozenset:
+    """Return the keyword groups present in text, in a single scan."""
+    if _KEYWORD_AUTOMATON is not None:
+        return frozenset(group for _, group in _KEYWORD_AUTOMATON.iter(text.lower()))
+    return frozenset(match.lastgroup for match in _REQUIREMENT_KEYWORDS.finditer(text))
+
+# Use cases in priority order, and channels in reporting order
+_USE_CASES = ("customer_service", "sales", "restaurant")
+_CHANNELS = ("phone", "web", "mobile")
+
+
+# Code generation prompt; fields are filled in by _PromptFields
+_PROMPT_TEMPLATE = """
 Generate a complete, production-ready Pipecat agent based on these requirements:
 
 **Agent Requirements:**
-- Use Case: {requirements.get('use_case', 'General assistant')}
-- Channels: {', '.join(requirements.get('channels', ['web']))}
-- Languages: {', '.join(requirements.get('languages', ['English']))}
-- Personality: {requirements.get('personality', 'Professional and helpful')}
-- Integrations: {', '.join(requirements.get('integrations', ['None']))}
-- Special Features: {', '.join(requirements.get('special_features', ['None']))}
+- Use Case: {use_case}
+- Channels: {channels}
+- Languages: {languages}
+- Personality: {personality}
+- Integrations: {integrations}
+- Special Features: {special_features}
 
 **Generate these files:**
 
@@ -163,12 +167,115 @@ FILE: .env.example
 
 Generate professional, well-documented, production-ready code.
 """
+
+# Fallback for each prompt field, and which fields are lists to join
+_PROMPT_DEFAULTS = {
+    "use_case": "General assistant",
+    "channels": ["web"],
+    "languages": ["English"],
+    "personality": "Professional and helpful",
+    "integrations": ["None"],
+    "special_features": ["None"],
+}
+_JOINED_PROMPT_FIELDS = frozenset({"channels", "languages", "integrations", "special_features"})
+
+
+class _PromptFields(dict):
+    """format_map mapping that resolves prompt fields from requirements on demand."""
     
-    async def _call_openai_for_generation(self, prompt: str) -> str:
-        """Call OpenAI to generate the agent code."""
+    def __init__(self, requirements: dict):
+        super().__init__()
+        self._requirements = requirements
+    
+    def __missing__(self, key: str) -> str:
+        value = self._requirements.get(key, _PROMPT_DEFAULTS[key])
+        if key in _JOINED_PROMPT_FIELDS:
+            return ', '.join(value)
+        return value
+
+
+@dataclass(slots=True)
+class CollectedInfo:
+    """Requirements gathered from the conversation so far."""
+    use_case: str | None = None
+    channels: list = field(default_factory=list)
+    languages: list = field(default_factory=list)
+    personality: str | None = None
+    integrations: list = field(default_factory=list)
+    special_features: list = field(default_factory=list)
+
+
+class AgentBuilderState:
+    """Manages the conversation state for building agents."""
+    
+    __slots__ = ("requirements", "conversation_stage", "agent_type",
+                 "collected_info", "_completed_count")
+    
+    # Fields that count towards completion status
+    _REQUIRED = ("use_case", "channels", "personality")
+    
+    def __init__(self):
+        self.requirements = {}
+        self.conversation_stage = "greeting"
+        self.agent_type = None
+        self.collected_info = CollectedInfo()
+        self._completed_count = 0  # Required fields currently holding a value
+    
+    def update_requirements(self, key: str, value: object):
+        """Update agent requirements based on user input."""
+        if key in self._REQUIRED:
+            self._completed_count += bool(value) - bool(getattr(self.collected_info, key))
+        setattr(self.collected_info, key, value)
+        logger.info(f"Updated {key}: {value}")
+    
+    def get_completion_status(self) -> float:
+        """Return percentage of requirements collected."""
+        return self._completed_count / len(self._REQUIRED)
+    
+    def is_ready_to_generate(self) -> bool:
+        """Check if we have enough info to generate an agent."""
+        return self.get_completion_status() >= 0.8
+
+
+class AgentCodeGenerator:
+    """Generates complete Pipecat agent code based on requirements."""
+    
+    __slots__ = ("openai_service",)
+    
+    def __init__(self, openai_service):
+        self.openai_service = openai_service
+    
+    async def generate_agent_code(self, requirements: dict) -> dict[str, str]:
+        """Generate complete Pipecat agent code files."""
+        
+        # Create detailed prompt for code generation
+        prompt = self._create_generation_prompt(requirements)
+        
+        # Stream the code from OpenAI and split it into files as it arrives
+        chunks: asyncio.Queue = asyncio.Queue()
+        _, files = await asyncio.gather(
+            self._feed_generation(prompt, chunks),
+            self._parse_generated_code_streaming(chunks),
+        )
+        return files
+    
+    def _create_generation_prompt(self, requirements: dict) -> str:
+        """Create a detailed prompt for agent generation."""
+        return _PROMPT_TEMPLATE.format_map(_PromptFields(requirements))
+    
+    async def _feed_generation(self, prompt: str, chunks: asyncio.Queue):
+        """Put generated chunks on the queue, then None to mark the end."""
+        try:
+            async for chunk in self._call_openai_for_generation(prompt):
+                await chunks.put(chunk)
+        finally:
+            await chunks.put(None)
+    
+    async def _call_openai_for_generation(self, prompt: str) -> AsyncIterator[str]:
+        """Stream the generated agent code from OpenAI."""
         # This would integrate with the OpenAI service
-        # For now, return a placeholder that shows the structure
-        return """
+        # For now, yield a placeholder that shows the structure
+        yield """
 FILE: bot.py
 # Generated Pipecat agent code would be here
 
@@ -188,24 +295,69 @@ FILE: .env.example
 # Environment template would be here
 """
     
-    def _parse_generated_code(self, response: str, requirements: Dict) -> Dict[str, str]:
+    def _parse_generated_code(self, response: str, requirements: dict) -> dict[str, str]:
         """Parse the generated response into separate files."""
         files = {}
+        
+        # Slice the response between FILE: markers rather than splitting lines
+        markers = list(_FILE_MARKER.finditer(response))
+        for i, marker in enumerate(markers):
+            name = marker.group(1).replace('FILE: ', '').strip()
+            if i + 1 < len(markers):
+                end = markers[i + 1].start()
+                # Drop the newline that ends the last content line
+                if end > marker.end():
+                    end -= 1
+            else:
+                end = len(response)
+            if name:
+                files[name] = response[marker.end():end]
+        
+        return files
+    
+    async def _parse_generated_code_streaming(self, chunks: asyncio.Queue) -> dict[str, str]:
+        """Split streamed output into files, closing each one at the next FILE: marker.
+        
+        Produces the same files as _parse_generated_code on the joined stream.
+        """
+        files = {}
+        buffer = ""
         current_file = None
-        current_content = []
+        content_start = 0
+        scan_from = 0
         
-        for line in response.split('\n'):
-            if line.startswith('FILE: '):
+        while True:
+            chunk = await chunks.get()
+            done = chunk is None
+            if not done:
+                buffer += chunk
+            
+            # A marker can only be recognized once its line is complete
+            limit = len(buffer) if done else buffer.rfind('\n') + 1
+            for marker in _FILE_MARKER.finditer(buffer, scan_from, limit):
                 if current_file:
-                    files[current_file] = '\n'.join(current_content)
-                current_file = line.replace('FILE: ', '').strip()
-                current_content = []
-            elif current_file:
-                current_content.append(line)
+                    end = marker.start()
+                    # Drop the newline that ends the last content line
+                    if end > content_start:
+                        end -= 1
+                    files[current_file] = buffer[content_start:end]
+                current_file = marker.group(1).replace('FILE: ', '').strip()
+                content_start = marker.end()
+            scan_from = max(scan_from, limit)
+            
+            if done:
+                break
+            
+            # Discard text that no longer belongs to an open file
+            keep = content_start if current_file else scan_from
+            if keep:
+                buffer = buffer[keep:]
+                scan_from -= keep
+                content_start = max(content_start - keep, 0)
         
         # Add the last file
         if current_file:
-            files[current_file] = '\n'.join(current_content)
+            files[current_file] = buffer[content_start:]
         
         return files
 
@@ -213,17 +365,29 @@ FILE: .env.example
 async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     """Main bot logic for the Agent Builder."""
     logger.info("Starting Agent Builder bot")
+    keys = _service_keys()
+
+    from pipecat.frames.frames import LLMRunFrame
+    from pipecat.pipeline.pipeline import Pipeline
+    from pipecat.pipeline.runner import PipelineRunner
+    from pipecat.pipeline.task import PipelineParams, PipelineTask
+    from pipecat.processors.aggregators.llm_context import LLMContext
+    from pipecat.processors.aggregators.llm_response_universal import LLMContextAggregatorPair
+    from pipecat.processors.frameworks.rtvi import RTVIConfig, RTVIObserver, RTVIProcessor
+    from pipecat.services.cartesia.tts import CartesiaTTSService
+    from pipecat.services.deepgram.stt import DeepgramSTTService
+    from pipecat.services.openai.llm import OpenAILLMService
 
     # Initialize AI services
-    stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"))
+    stt = DeepgramSTTService(api_key=keys.deepgram)
     
     tts = CartesiaTTSService(
-        api_key=os.getenv("CARTESIA_API_KEY"),
+        api_key=keys.cartesia,
         voice_id="71a7ad14-091c-4e8e-a314-022ece01c121",  # British Reading Lady
     )
     
     llm = OpenAILLMService(
-        api_key=os.getenv("OPENAI_API_KEY"),
+        api_key=keys.openai,
         model="gpt-4o"
     )
 
@@ -310,47 +474,46 @@ Keep it friendly and conversational."""
     class RequirementsProcessor:
         def __init__(self, state: AgentBuilderState):
             self.state = state
+            self._last_text = None
         
         async def process_user_input(self, text: str):
             """Analyze user input and update requirements."""
-            text_lower = text.lower()
+            # Streaming STT often repeats a transcript; the updates would be identical
+            if text == self._last_text:
+                return
+            self._last_text = text
+            
+            # One pass finds every keyword group present in the text
+            found = _find_requirement_keywords(text)
             
             # Detect use cases
-            if any(word in text_lower for word in ["customer service", "support", "help desk"]):
-                self.state.update_requirements("use_case", "customer_service")
-            elif any(word in text_lower for word in ["sales", "lead", "prospect"]):
-                self.state.update_requirements("use_case", "sales")
-            elif any(word in text_lower for word in ["restaurant", "reservation", "booking"]):
-                self.state.update_requirements("use_case", "restaurant")
+            for use_case in _USE_CASES:
+                if use_case in found:
+                    self.state.update_requirements("use_case", use_case)
+                    break
             
             # Detect channels
-            channels = []
-            if "phone" in text_lower:
-                channels.append("phone")
-            if any(word in text_lower for word in ["web", "website", "browser"]):
-                channels.append("web")
-            if "mobile" in text_lower:
-                channels.append("mobile")
+            channels = [channel for channel in _CHANNELS if channel in found]
             
             if channels:
                 self.state.update_requirements("channels", channels)
             
             # Detect languages
             languages = []
-            if "spanish" in text_lower:
+            if "spanish" in found:
                 languages.append("Spanish")
-            if "french" in text_lower:
+            if "french" in found:
                 languages.append("French")
-            if "english" in text_lower or not languages:
+            if "english" in found or not languages:
                 languages.append("English")
             
             if languages:
                 self.state.update_requirements("languages", languages)
             
             # Detect personality traits
-            if any(word in text_lower for word in ["friendly", "warm", "casual"]):
+            if "friendly" in found:
                 self.state.update_requirements("personality", "Friendly and approachable")
-            elif any(word in text_lower for word in ["professional", "formal", "business"]):
+            elif "professional" in found:
                 self.state.update_requirements("personality", "Professional and courteous")
             
             logger.info(f"Updated state: {self.state.collected_info}")
@@ -364,26 +527,84 @@ Keep it friendly and conversational."""
     await runner.run(task)
 
 
+# VAD and turn analyzers from finished sessions. Reusing them lets later
+# sessions in the same process skip loading the models, while concurrent
+# sessions never share an analyzer's audio state.
+_idle_analyzers: list = []
+
+# The startup banners describe the cold start, so only the first session prints them
+_banners_shown = False
+
+
+def _acquire_analyzers():
+    """Return a (VAD, turn) analyzer pair, loading the models only if none is idle."""
+    if _idle_analyzers:
+        return _idle_analyzers.pop()
+    from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
+    from pipecat.audio.vad.silero import SileroVADAnalyzer
+    from pipecat.audio.vad.vad_analyzer import VADParams
+    return SileroVADAnalyzer(params=VADParams(stop_secs=0.2)), LocalSmartTurnAnalyzerV3()
+
+
+def _release_analyzers(vad_analyzer, turn_analyzer):
+    """Clear a finished session's audio from an analyzer pair and pool it.
+    
+    The next session's transport start only sets the sample rate, so any
+    audio buffered when a caller hung up would otherwise leak into the next
+    caller's first VAD and end-of-turn decisions.
+    """
+    turn_analyzer.clear()
+    
+    # VADAnalyzer has no public reset; set_params zeroes the start/stop
+    # counters and state, and needs a sample rate from a started session
+    vad_analyzer._vad_buffer = b""
+    vad_analyzer._prev_volume = 0
+    if vad_analyzer.sample_rate:
+        vad_analyzer.set_params(vad_analyzer.params)
+    model = getattr(vad_analyzer, "_model", None)
+    if model is not None:
+        model.reset_states()
+    
+    _idle_analyzers.append((vad_analyzer, turn_analyzer))
+
+
 async def bot(runner_args: RunnerArguments):
     """Main bot entry point for Pipecat Cloud deployment."""
+    global _banners_shown
+    
+    # Banners are for local runs; in the cloud stdout is a captured pipe
+    if not _banners_shown and sys.stdout.isatty():
+        print("🤖 Starting Pipecat Agent Builder...")
+        print("⏳ Loading models and imports (20 seconds, first run only)\n")
+    _banners_shown = True
+
+    start = time.perf_counter()
+    from pipecat.runner.utils import create_transport
+    from pipecat.transports.base_transport import TransportParams
+    from pipecat.transports.daily.transport import DailyParams
+    vad_analyzer, turn_analyzer = _acquire_analyzers()
+    logger.debug("Cold-start imports took {:.2f}s", time.perf_counter() - start)
     
     transport_params = {
         "daily": lambda: DailyParams(
             audio_in_enabled=True,
             audio_out_enabled=True,
-            vad_analyzer=SileroVADAnalyzer(params=VADParams(stop_secs=0.2)),
-            turn_analyzer=LocalSmartTurnAnalyzerV3(),
+            vad_analyzer=vad_analyzer,
+            turn_analyzer=turn_analyzer,
         ),
         "webrtc": lambda: TransportParams(
             audio_in_enabled=True,
             audio_out_enabled=True,
-            vad_analyzer=SileroVADAnalyzer(params=VADParams(stop_secs=0.2)),
-            turn_analyzer=LocalSmartTurnAnalyzerV3(),
+            vad_analyzer=vad_analyzer,
+            turn_analyzer=turn_analyzer,
         ),
     }
 
-    transport = await create_transport(runner_args, transport_params)
-    await run_bot(transport, runner_args)
+    try:
+        transport = await create_transport(runner_args, transport_params)
+        await run_bot(transport, runner_args)
+    finally:
+        _release_analyzers(vad_analyzer, turn_analyzer)
 
 
 if __name__ == "__main__":
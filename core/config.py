@@ -1,24 +1,28 @@
 """Configuration management for Pipecat Agent Builder."""
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
 from pydantic import BaseModel, Field, ConfigDict
 from pydantic_settings import BaseSettings
 
 
 class AIServiceConfig(BaseModel):
     """Configuration for AI services."""
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     provider: str
-    api_key: Optional[str] = None
-    model: Optional[str] = None
-    voice_id: Optional[str] = None
+    api_key: str | None = None
+    model: str | None = None
+    voice_id: str | None = None
     language: str = "en"
 
 
 class DeploymentConfig(BaseModel):
     """Configuration for deployment settings."""
+    model_config = ConfigDict(frozen=True)
+    
     platform: str = "pipecat-cloud"
     scaling_min: int = 1
     scaling_max: int = 10
@@ -28,6 +32,8 @@ class DeploymentConfig(BaseModel):
 
 class KnowledgeSourceConfig(BaseModel):
     """Configuration for knowledge sources."""
+    model_config = ConfigDict(frozen=True)
+    
     type: str  # "web", "document", "api", "database"
     source: str  # URL, file path, API endpoint, etc.
     processing_options: dict = Field(default_factory=dict)
@@ -35,21 +41,23 @@ class KnowledgeSourceConfig(BaseModel):
 
 class AgentRequirements(BaseModel):
     """User requirements for the agent being built."""
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     description: str
     use_case: str
-    channels: List[str] = Field(default_factory=list)  # ["phone", "web", "mobile"]
-    languages: List[str] = Field(default_factory=lambda: ["en"])
+    channels: list[str] = Field(default_factory=list)  # ["phone", "web", "mobile"]
+    languages: list[str] = Field(default_factory=lambda: ["en"])
     personality: str = "helpful and professional"
     
     # Service preferences
-    stt_service: Optional[AIServiceConfig] = None
-    llm_service: Optional[AIServiceConfig] = None
-    tts_service: Optional[AIServiceConfig] = None
+    stt_service: AIServiceConfig | None = None
+    llm_service: AIServiceConfig | None = None
+    tts_service: AIServiceConfig | None = None
     
     # Knowledge and integrations
-    knowledge_sources: List[KnowledgeSourceConfig] = Field(default_factory=list)
-    integrations: List[str] = Field(default_factory=list)
+    knowledge_sources: list[KnowledgeSourceConfig] = Field(default_factory=list)
+    integrations: list[str] = Field(default_factory=list)
     
     # Deployment preferences
     deployment: DeploymentConfig = Field(default_factory=DeploymentConfig)
@@ -59,19 +67,19 @@ class Settings(BaseSettings):
     """Application settings."""
     
     # API Keys
-    pipecat_cloud_api_key: Optional[str] = None
-    pipecat_cloud_org_id: Optional[str] = None
-    openai_api_key: Optional[str] = None
-    anthropic_api_key: Optional[str] = None
-    deepgram_api_key: Optional[str] = None
-    cartesia_api_key: Optional[str] = None
-    elevenlabs_api_key: Optional[str] = None
-    daily_api_key: Optional[str] = None
+    pipecat_cloud_api_key: str | None = None
+    pipecat_cloud_org_id: str | None = None
+    openai_api_key: str | None = None
+    anthropic_api_key: str | None = None
+    deepgram_api_key: str | None = None
+    cartesia_api_key: str | None = None
+    elevenlabs_api_key: str | None = None
+    daily_api_key: str | None = None
     
     # Telephony
-    twilio_account_sid: Optional[str] = None
-    twilio_auth_token: Optional[str] = None
-    telnyx_api_key: Optional[str] = None
+    twilio_account_sid: str | None = None
+    twilio_auth_token: str | None = None
+    telnyx_api_key: str | None = None
     
     # Vector Database
     chroma_persist_directory: str = "./data/chroma_db"
@@ -79,11 +87,11 @@ class Settings(BaseSettings):
     
     # MCP Configuration
     mcp_server_url: str = "ws://localhost:8765"
-    windsurf_cascade_endpoint: Optional[str] = None
+    windsurf_cascade_endpoint: str | None = None
     
     # Docker
-    docker_hub_username: Optional[str] = None
-    docker_hub_token: Optional[str] = None
+    docker_hub_username: str | None = None
+    docker_hub_token: str | None = None
     
     # Application
     debug: bool = False
@@ -102,10 +110,24 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading the environment only once."""
+    return Settings()
+
+
+def _ensure_dirs(settings: Settings):
+    """Create the required directories once per process."""
+    if getattr(_ensure_dirs, "_done", False):
+        return
+    Path(settings.chroma_persist_directory).mkdir(parents=True, exist_ok=True)
+    Path(settings.output_path).mkdir(parents=True, exist_ok=True)
+    Path("./logs").mkdir(exist_ok=True)
+    _ensure_dirs._done = True
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
 # Ensure required directories exist
-Path(settings.chroma_persist_directory).mkdir(parents=True, exist_ok=True)
-Path(settings.output_path).mkdir(parents=True, exist_ok=True)
-Path("./logs").mkdir(exist_ok=True)
+_ensure_dirs(settings)
@@ -1,7 +1,11 @@
 """Logging configuration for Pipecat Agent Builder."""
 
+import atexit
+import copy
+import functools
 import logging
 import sys
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 from core.config import settings
@@ -19,12 +23,22 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
     
+    def __init__(self, *args, use_color: Optional[bool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Escape codes only help a terminal; piped or captured output stays plain
+        self._use_color = sys.stdout.isatty() if use_color is None else use_color
+    
     def format(self, record):
+        if not self._use_color:
+            return super().format(record)
+        # Color a copy: the record is shared with the other handlers
+        record = copy.copy(record)
         log_color = self.COLORS.get(record.levelname, self.RESET)
         record.levelname = f"{log_color}{record.levelname}{self.RESET}"
         return super().format(record)
 
 
+@functools.lru_cache(maxsize=None)
 def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """Set up a logger with both file and console handlers."""
     
@@ -47,15 +61,20 @@ def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
     
-    # File handler
+    # File handler; opened on first write and fed in batches of records,
+    # flushed early on errors
     log_file = Path("logs") / f"{name}.log"
-    file_handler = logging.FileHandler(log_file)
+    file_handler = RotatingFileHandler(
+        log_file, maxBytes=10 * 1024 * 1024, backupCount=3, delay=True
+    )
     file_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    buffered_handler = MemoryHandler(512, flushLevel=logging.ERROR, target=file_handler)
+    atexit.register(buffered_handler.flush)
+    logger.addHandler(buffered_handler)
     
     return logger
 
@@ -1,28 +1,232 @@
 """Monitoring and metrics for Pipecat Agent Builder."""
 
 import time
+import array
 import asyncio
-from typing import Dict, Any, List, Optional
+import atexit
+import heapq
+import logging
+import queue
+import threading
+import weakref
+from types import MappingProxyType
+from typing import Dict, Any, Iterator, List, Mapping, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 import json
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import psutil
+except ImportError:
+    # psutil is optional; system metrics are skipped without it
+    psutil = None
+
 from core.logger import setup_logger
 
 logger = setup_logger("monitoring")
 
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    """Build a hashable, order-independent key for a label set."""
+    if not labels:
+        return ()
+    return tuple(sorted(labels.items()))
+
+
+# Shared read-only mapping per distinct label set, so points with the same
+# labels all reference one object
+_EMPTY_LABELS: Mapping[str, str] = MappingProxyType({})
+_LABEL_INTERN: Dict[LabelKey, Mapping[str, str]] = {}
+
+
+def _intern_labels(key: LabelKey) -> Mapping[str, str]:
+    """Return the interned read-only mapping for a label key."""
+    if not key:
+        return _EMPTY_LABELS
+    labels = _LABEL_INTERN.get(key)
+    if labels is None:
+        labels = _LABEL_INTERN.setdefault(key, MappingProxyType(dict(key)))
+    return labels
+
+
+# Queued by close() to stop a collector's drain worker
+_STOP = object()
+
+# Live collectors, flushed once at interpreter exit
+_collectors: "weakref.WeakSet[MetricsCollector]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_collectors():
+    """Apply buffered metrics of every live collector on shutdown."""
+    for collector in list(_collectors):
+        collector.flush()
 
-@dataclass
+
+def _export_records(values: Dict[Tuple[str, LabelKey], float]) -> List[Dict[str, Any]]:
+    """Materialize (name, labels) keyed values as structured records."""
+    return [
+        {"name": name, "labels": dict(labels), "value": value}
+        for (name, labels), value in values.items()
+    ]
+
+
+@dataclass(slots=True)
 class MetricPoint:
     """Individual metric measurement."""
-    timestamp: float
+    timestamp: float  # time.monotonic() seconds
     value: float
-    labels: Dict[str, str] = field(default_factory=dict)
+    labels: Mapping[str, str] = field(default_factory=dict)
 
 
-@dataclass
+class _MetricSeries:
+    """Fixed-size ring buffer of metric points stored as parallel arrays."""
+    
+    def __init__(self, max_points: int):
+        self.max_points = max_points
+        self.ts = np.zeros(max_points, dtype=np.float64)
+        self.val = np.zeros(max_points, dtype=np.float64)
+        self.labels: List[Mapping[str, str]] = [_EMPTY_LABELS] * max_points
+        self.head = 0  # next slot to write
+        self.count = 0
+        self.written = 0  # total points ever written, bumped on every append
+        
+        # Running aggregates over the whole ring. Unwritten slots hold 0, so
+        # subtracting whatever a write overwrites tracks the sum; float error
+        # from the add/subtract cycles is reset by resumming on each wraparound.
+        # The deques hold (sequence, value) candidates for the ring minimum
+        # and maximum, monotonic in value, with the answer at the front.
+        self.total = 0.0
+        self._min_candidates: deque = deque()
+        self._max_candidates: deque = deque()
+    
+    def append(self, timestamp: float, value: float, labels: Mapping[str, str]):
+        """Write one point, overwriting the oldest when full."""
+        slot = self.head
+        self.total += value - self.val[slot]
+        self.ts[slot] = timestamp
+        self.val[slot] = value
+        self.labels[slot] = labels
+        self.head = (slot + 1) % self.max_points
+        if self.head == 0:
+            self.total = float(self.val.sum())
+        if self.count < self.max_points:
+            self.count += 1
+        self._track_extremes(self.written, value)
+        self.written += 1
+    
+    def extend(self, timestamps: List[float], values: List[float], labels: List[Mapping[str, str]]):
+        """Write a batch of points with one vectorized store per array."""
+        n = len(values)
+        if n > self.max_points:
+            timestamps, values, labels = (
+                timestamps[-self.max_points:], values[-self.max_points:], labels[-self.max_points:]
+            )
+            n = self.max_points
+        slots = (self.head + np.arange(n)) % self.max_points
+        wrapped = self.head + n >= self.max_points
+        if not wrapped:
+            self.total += float(np.sum(values)) - float(self.val[slots].sum())
+        self.ts[slots] = timestamps
+        self.val[slots] = values
+        if wrapped:
+            self.total = float(self.val.sum())
+        for slot, point_labels in zip(slots.tolist(), labels):
+            self.labels[slot] = point_labels
+        self.head = (self.head + n) % self.max_points
+        self.count = min(self.count + n, self.max_points)
+        for offset, value in enumerate(values):
+            self._track_extremes(self.written + offset, value)
+        self.written += n
+    
+    def _track_extremes(self, seq: int, value: float):
+        """Update the windowed min/max candidates for a newly written point."""
+        value = float(value)
+        expired = seq - self.max_points
+        
+        candidates = self._min_candidates
+        if candidates and candidates[0][0] <= expired:
+            candidates.popleft()
+        while candidates and candidates[-1][1] >= value:
+            candidates.pop()
+        candidates.append((seq, value))
+        
+        candidates = self._max_candidates
+        if candidates and candidates[0][0] <= expired:
+            candidates.popleft()
+        while candidates and candidates[-1][1] <= value:
+            candidates.pop()
+        candidates.append((seq, value))
+    
+    def oldest_timestamp(self) -> float:
+        """Timestamp of the oldest point still in the ring."""
+        return float(self.ts[(self.head - self.count) % self.max_points])
+    
+    def summary(self) -> Dict[str, float]:
+        """Summary of every point in the ring from the running aggregates."""
+        return {
+            "count": self.count,
+            "min": self._min_candidates[0][1],
+            "max": self._max_candidates[0][1],
+            "avg": self.total / self.count,
+            "latest": float(self.val[self.head - 1])
+        }
+    
+    def window(self, cutoff: float) -> Tuple[float, np.ndarray]:
+        """Return (first timestamp, values) for points with timestamp >= cutoff.
+        
+        Points are appended in time order, so each ring segment is sorted
+        and the window start is found by binary search. The first timestamp
+        is inf when the window is empty.
+        """
+        if self.count < self.max_points:
+            start = int(np.searchsorted(self.ts[:self.count], cutoff, side="left"))
+            if start == self.count:
+                return float("inf"), self.val[:0]
+            return float(self.ts[start]), self.val[start:self.count]
+        
+        # Full ring: ts[head:] holds the older points, ts[:head] the newer ones
+        start = self.head + int(np.searchsorted(self.ts[self.head:], cutoff, side="left"))
+        if start < self.max_points:
+            return float(self.ts[start]), np.concatenate((self.val[start:], self.val[:self.head]))
+        start = int(np.searchsorted(self.ts[:self.head], cutoff, side="left"))
+        if start == self.head:
+            return float("inf"), self.val[:0]
+        return float(self.ts[start]), self.val[start:self.head]
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __getitem__(self, index: int) -> MetricPoint:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("metric point index out of range")
+        slot = (self.head - self.count + index) % self.max_points
+        return MetricPoint(
+            timestamp=float(self.ts[slot]),
+            value=float(self.val[slot]),
+            labels=self.labels[slot]
+        )
+    
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+
+@dataclass(slots=True)
 class BuildSession:
     """Track a complete agent building session."""
     session_id: str
@@ -57,34 +261,182 @@ class BuildSession:
 class MetricsCollector:
     """Collect and store application metrics."""
     
-    def __init__(self, max_points: int = 1000):
-        self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_points))
-        self.counters: Dict[str, int] = defaultdict(int)
-        self.gauges: Dict[str, float] = defaultdict(float)
-        self.sessions: Dict[str, BuildSession] = {}
+    def __init__(self, max_points: int = 1000, max_sessions: int = 10000,
+                 queue_size: int = 10000, batch_size: int = 256,
+                 counter_batch_size: int = 100):
+        self.metrics: Dict[str, _MetricSeries] = defaultdict(lambda: _MetricSeries(max_points))
+        # Counter and gauge values live in flat arrays indexed by an id
+        # assigned to each (name, labels) key on first use
+        self._counter_ids: Dict[Tuple[str, LabelKey], int] = {}
+        self._counter_keys: List[Tuple[str, LabelKey]] = []
+        self._counter_values = array.array('q')
+        self._gauge_ids: Dict[Tuple[str, LabelKey], int] = {}
+        self._gauge_values = array.array('d')
+        # Increments are coalesced per counter id and recorded as one point
+        # on flush, or once counter_batch_size increments have accumulated
+        self._counter_batch_size = counter_batch_size
+        self._counter_pending: Dict[int, int] = {}
+        # (name, window_minutes) -> (series.written, first timestamp in window, summary)
+        self._summary_cache: Dict[Tuple[str, int], Tuple[int, float, Dict[str, float]]] = {}
+        self.sessions: "OrderedDict[str, BuildSession]" = OrderedDict()
+        self._max_sessions = max_sessions
         self.start_time = time.time()
+        
+        # (duration, status) of ended sessions whose metrics are not yet recorded
+        self._pending_session_ends: List[Tuple[float, str]] = []
+        
+        # Running session totals so stats don't rescan every session
+        self._total_sessions = 0
+        self._completed_count = 0
+        self._failed_count = 0
+        self._completed_duration_sum = 0.0
+        
+        # Metric points are queued by callers and applied in batches by a
+        # background worker, so recording on the request path is an enqueue.
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._drain, name="metrics-drain", daemon=True)
+        self._worker.start()
+        _collectors.add(self)
     
     def record_metric(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
         """Record a metric point."""
-        point = MetricPoint(
-            timestamp=time.time(),
-            value=value,
-            labels=labels or {}
-        )
-        self.metrics[name].append(point)
-        logger.debug(f"Recorded metric {name}: {value}")
+        # Convert here so bad input fails at the caller, not in a shared batch
+        self._enqueue(name, float(value), _label_key(labels))
+    
+    def _enqueue(self, name: str, value: float, labels: LabelKey):
+        """Queue a point; labels are already reduced to their key tuple."""
+        item = (name, value, labels)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Apply backpressure instead of dropping the point
+            self.flush()
+            self._queue.put(item)
+    
+    def flush(self):
+        """Apply all queued metric points before returning."""
+        self.flush_session_metrics()
+        self.flush_counters()
+        with self._lock:
+            while True:
+                batch = self._collect_batch()
+                if not batch:
+                    break
+                self._apply_batch(batch)
+        # Wait for any batch the worker already took off the queue
+        self._queue.join()
+    
+    def close(self):
+        """Apply queued points and stop the background worker."""
+        if not self._worker.is_alive():
+            return
+        self.flush()
+        self._queue.put(_STOP)
+        self._worker.join()
+    
+    def _drain(self):
+        """Background worker applying queued metric points."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            with self._lock:
+                self._apply_batch(self._collect_batch(item))
+    
+    def _collect_batch(self, first: Optional[tuple] = None) -> List[tuple]:
+        """Take up to batch_size queued items without blocking."""
+        batch = [] if first is None else [first]
+        while len(batch) < self._batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Leave the stop request queued for the worker to see
+                self._queue.task_done()
+                self._queue.put_nowait(item)
+                break
+            batch.append(item)
+        return batch
+    
+    def _apply_batch(self, batch: List[tuple]):
+        """Append a batch of queued points, one extend per metric name.
+        
+        Never raises: a batch that cannot be applied is logged and dropped.
+        """
+        try:
+            # One clock read stamps the whole batch
+            now = time.monotonic()
+            grouped: Dict[str, tuple] = {}
+            for name, value, labels in batch:
+                columns = grouped.get(name)
+                if columns is None:
+                    columns = grouped[name] = ([], [], [])
+                columns[0].append(now)
+                columns[1].append(value)
+                columns[2].append(_intern_labels(labels))
+            for name, (timestamps, values, labels) in grouped.items():
+                self.metrics[name].extend(timestamps, values, labels)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Recorded %d metric points", len(batch))
+        except Exception:
+            # Drop the bad batch so neither the worker nor flush() dies on it
+            logger.exception("Failed to apply %d metric points", len(batch))
+        finally:
+            # Always settle the batch so flush() never waits on it forever
+            for _ in batch:
+                self._queue.task_done()
     
-    def increment_counter(self, name: str, labels: Optional[Dict[str, str]] = None):
+    @property
+    def counters(self) -> Dict[Tuple[str, LabelKey], int]:
+        """Current counter values keyed by (name, labels)."""
+        return {key: self._counter_values[idx] for key, idx in self._counter_ids.items()}
+    
+    @property
+    def gauges(self) -> Dict[Tuple[str, LabelKey], float]:
+        """Current gauge values keyed by (name, labels)."""
+        return {key: self._gauge_values[idx] for key, idx in self._gauge_ids.items()}
+    
+    def increment_counter(self, name: str, labels: Optional[Dict[str, str]] = None, amount: int = 1):
         """Increment a counter metric."""
-        key = f"{name}:{json.dumps(labels or {}, sort_keys=True)}"
-        self.counters[key] += 1
-        self.record_metric(name, self.counters[key], labels)
+        key = (name, _label_key(labels))
+        idx = self._counter_ids.get(key)
+        if idx is None:
+            idx = self._counter_ids[key] = len(self._counter_values)
+            self._counter_keys.append(key)
+            self._counter_values.append(0)
+        self._counter_values[idx] += amount
+        
+        pending = self._counter_pending.get(idx, 0) + amount
+        if pending >= self._counter_batch_size:
+            self._counter_pending.pop(idx, None)
+            self._enqueue(name, self._counter_values[idx], key[1])
+        else:
+            self._counter_pending[idx] = pending
+    
+    def flush_counters(self):
+        """Record one point per counter incremented since its last point."""
+        if not self._counter_pending:
+            return
+        pending, self._counter_pending = self._counter_pending, {}
+        for idx in pending:
+            name, labels = self._counter_keys[idx]
+            self._enqueue(name, self._counter_values[idx], labels)
     
     def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
         """Set a gauge metric."""
-        key = f"{name}:{json.dumps(labels or {}, sort_keys=True)}"
-        self.gauges[key] = value
-        self.record_metric(name, value, labels)
+        key = (name, _label_key(labels))
+        idx = self._gauge_ids.get(key)
+        if idx is None:
+            idx = self._gauge_ids[key] = len(self._gauge_values)
+            self._gauge_values.append(value)
+        else:
+            self._gauge_values[idx] = value
+        self._enqueue(name, value, key[1])
     
     def start_session(self, session_id: str, agent_name: Optional[str] = None, use_case: Optional[str] = None) -> BuildSession:
         """Start tracking a build session."""
@@ -94,27 +446,83 @@ class MetricsCollector:
             agent_name=agent_name,
             use_case=use_case
         )
+        previous = self.sessions.get(session_id)
+        if previous is not None:
+            self._tally_session(previous, -1)
+        else:
+            self._total_sessions += 1
         self.sessions[session_id] = session
+        self.sessions.move_to_end(session_id)
+        self._evict_sessions()
         self.increment_counter("sessions_started")
-        logger.info(f"Started session {session_id}")
+        logger.info("Started session %s", session_id)
         return session
     
     def end_session(self, session_id: str, status: str = "completed", error_message: Optional[str] = None):
         """End a build session."""
         if session_id not in self.sessions:
-            logger.warning(f"Session {session_id} not found")
+            logger.warning("Session %s not found", session_id)
             return
         
         session = self.sessions[session_id]
+        self._tally_session(session, -1)
         session.end_time = time.time()
         session.status = status
         session.error_message = error_message
+        self._tally_session(session, 1)
         
-        # Record session metrics
-        self.record_metric("session_duration", session.duration(), {"status": status})
-        self.increment_counter("sessions_completed", {"status": status})
+        # Session metrics are buffered and recorded in bulk by flush_session_metrics
+        self._pending_session_ends.append((session.duration(), status))
         
-        logger.info(f"Ended session {session_id} with status {status}")
+        logger.info("Ended session %s with status %s", session_id, status)
+    
+    def flush_session_metrics(self):
+        """Record buffered session-end metrics, one bulk write per status."""
+        if not self._pending_session_ends:
+            return
+        pending, self._pending_session_ends = self._pending_session_ends, []
+        
+        durations_by_status: Dict[str, List[float]] = defaultdict(list)
+        for duration, status in pending:
+            durations_by_status[status].append(duration)
+        
+        with self._lock:
+            # Stamp under the lock so the series stays in time order
+            now = time.monotonic()
+            series = self.metrics["session_duration"]
+            for status, durations in durations_by_status.items():
+                labels = _intern_labels(_label_key({"status": status}))
+                series.extend([now] * len(durations), durations, [labels] * len(durations))
+        
+        for status, durations in durations_by_status.items():
+            self.increment_counter("sessions_completed", {"status": status}, amount=len(durations))
+    
+    def _evict_sessions(self):
+        """Drop the oldest finished sessions once over max_sessions."""
+        excess = len(self.sessions) - self._max_sessions
+        if excess <= 0:
+            return
+        
+        # In-progress sessions are never evicted, so skip past them
+        victims = []
+        for session_id, session in self.sessions.items():
+            if session.status != "in_progress":
+                victims.append(session_id)
+                if len(victims) == excess:
+                    break
+        
+        for session_id in victims:
+            session = self.sessions.pop(session_id)
+            self._tally_session(session, -1)
+            self._total_sessions -= 1
+    
+    def _tally_session(self, session: BuildSession, sign: int):
+        """Add (sign=1) or remove (sign=-1) an ended session from the running totals."""
+        if session.status == "completed":
+            self._completed_count += sign
+            self._completed_duration_sum += sign * session.duration()
+        elif session.status == "failed":
+            self._failed_count += sign
     
     def record_session_metric(self, session_id: str, metric_name: str, value: Any):
         """Record a metric for a specific session."""
@@ -123,12 +531,12 @@ class MetricsCollector:
     
     def get_session_stats(self) -> Dict[str, Any]:
         """Get session statistics."""
-        total_sessions = len(self.sessions)
-        completed_sessions = sum(1 for s in self.sessions.values() if s.status == "completed")
-        failed_sessions = sum(1 for s in self.sessions.values() if s.status == "failed")
+        total_sessions = self._total_sessions
+        completed_sessions = self._completed_count
+        failed_sessions = self._failed_count
         
         if completed_sessions > 0:
-            avg_duration = sum(s.duration() for s in self.sessions.values() if s.status == "completed") / completed_sessions
+            avg_duration = self._completed_duration_sum / completed_sessions
         else:
             avg_duration = 0
         
@@ -143,36 +551,74 @@ class MetricsCollector:
     
     def get_metric_summary(self, name: str, window_minutes: int = 60) -> Dict[str, float]:
         """Get summary statistics for a metric within a time window."""
+        self.flush()
+        return self._summarize(name, window_minutes)
+    
+    def iter_metric_summaries(self, window_minutes: int = 60) -> Iterator[Tuple[str, Dict[str, float]]]:
+        """Yield (name, summary) for every metric without building a full dict."""
+        self.flush()
+        for name in list(self.metrics):
+            yield name, self._summarize(name, window_minutes)
+    
+    def _summarize(self, name: str, window_minutes: int) -> Dict[str, float]:
+        """Summarize a metric's window; callers flush queued points first."""
         if name not in self.metrics:
             return {}
         
-        cutoff_time = time.time() - (window_minutes * 60)
-        recent_points = [p for p in self.metrics[name] if p.timestamp >= cutoff_time]
-        
-        if not recent_points:
-            return {}
-        
-        values = [p.value for p in recent_points]
-        return {
-            "count": len(values),
-            "min": min(values),
-            "max": max(values),
-            "avg": sum(values) / len(values),
-            "latest": values[-1] if values else 0
-        }
+        cutoff_time = time.monotonic() - (window_minutes * 60)
+        with self._lock:
+            series = self.metrics[name]
+            if not series.count:
+                return {}
+            
+            # A cached summary stays valid while nothing has been appended and
+            # no point in it has aged out of the window yet.
+            cache_key = (name, window_minutes)
+            cached = self._summary_cache.get(cache_key)
+            if cached is not None and cached[0] == series.written and cutoff_time <= cached[1]:
+                return dict(cached[2])
+            
+            # When the whole ring is inside the window, the running
+            # aggregates answer directly without touching the arrays
+            oldest_timestamp = series.oldest_timestamp()
+            if oldest_timestamp >= cutoff_time:
+                summary = series.summary()
+                self._summary_cache[cache_key] = (series.written, oldest_timestamp, summary)
+                return dict(summary)
+            
+            # values may be a view into the ring, so reduce while locked
+            first_timestamp, values = series.window(cutoff_time)
+            if values.size:
+                summary = {
+                    "count": int(values.size),
+                    "min": float(values.min()),
+                    "max": float(values.max()),
+                    "avg": float(values.mean()),
+                    "latest": float(values[-1])
+                }
+            else:
+                summary = {}
+            
+            self._summary_cache[cache_key] = (series.written, first_timestamp, summary)
+            return dict(summary)
     
     def export_metrics(self) -> Dict[str, Any]:
         """Export all metrics for external monitoring."""
+        self.flush()
         return {
             "timestamp": time.time(),
             "session_stats": self.get_session_stats(),
-            "counters": dict(self.counters),
-            "gauges": dict(self.gauges),
-            "metric_summaries": {
-                name: self.get_metric_summary(name) 
-                for name in self.metrics.keys()
-            }
+            "counters": _export_records(self.counters),
+            "gauges": _export_records(self.gauges),
+            "metric_summaries": dict(self.iter_metric_summaries())
         }
+    
+    def export_metrics_json(self) -> str:
+        """Export all metrics serialized as JSON."""
+        exported = self.export_metrics()
+        if orjson is not None:
+            return orjson.dumps(exported).decode()
+        return json.dumps(exported)
 
 
 class PerformanceMonitor:
@@ -181,6 +627,14 @@ class PerformanceMonitor:
     def __init__(self, metrics_collector: MetricsCollector):
         self.metrics = metrics_collector
         self.monitoring_active = False
+        self._process = None
+        
+        if psutil is not None:
+            # Prime the CPU counters: later interval=None calls return the
+            # usage since the previous call instead of sleeping to measure it.
+            psutil.cpu_percent(interval=None)
+            self._process = psutil.Process()
+            self._process.cpu_percent(interval=None)
     
     async def start_monitoring(self, interval_seconds: int = 30):
         """Start background performance monitoring."""
@@ -192,7 +646,7 @@ class PerformanceMonitor:
                 await self._collect_system_metrics()
                 await asyncio.sleep(interval_seconds)
             except Exception as e:
-                logger.error(f"Error in performance monitoring: {e}")
+                logger.error("Error in performance monitoring: %s", e)
                 await asyncio.sleep(interval_seconds)
     
     def stop_monitoring(self):
@@ -202,11 +656,15 @@ class PerformanceMonitor:
     
     async def _collect_system_metrics(self):
         """Collect system performance metrics."""
+        self.metrics.flush_session_metrics()
+        self.metrics.flush_counters()
+        
+        if psutil is None:
+            return
+        
         try:
-            import psutil
-            
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU usage since the previous collection (non-blocking)
+            cpu_percent = psutil.cpu_percent(interval=None)
             self.metrics.set_gauge("system_cpu_percent", cpu_percent)
             
             # Memory usage
@@ -219,15 +677,11 @@ class PerformanceMonitor:
             self.metrics.set_gauge("system_disk_percent", (disk.used / disk.total) * 100)
             
             # Process-specific metrics
-            process = psutil.Process()
-            self.metrics.set_gauge("process_memory_mb", process.memory_info().rss / 1024 / 1024)
-            self.metrics.set_gauge("process_cpu_percent", process.cpu_percent())
+            self.metrics.set_gauge("process_memory_mb", self._process.memory_info().rss / 1024 / 1024)
+            self.metrics.set_gauge("process_cpu_percent", self._process.cpu_percent(interval=None))
             
-        except ImportError:
-            # psutil not available, skip system metrics
-            pass
         except Exception as e:
-            logger.warning(f"Failed to collect system metrics: {e}")
+            logger.warning("Failed to collect system metrics: %s", e)
 
 
 class HealthChecker:
@@ -240,45 +694,52 @@ class HealthChecker:
     def register_health_check(self, name: str, check_func):
         """Register a health check function."""
         self.health_checks[name] = check_func
-        logger.debug(f"Registered health check: {name}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Registered health check: %s", name)
     
     async def run_health_checks(self) -> Dict[str, Any]:
-        """Run all registered health checks."""
-        results = {}
-        overall_healthy = True
+        """Run all registered health checks concurrently."""
+        names = list(self.health_checks)
+        outcomes = await asyncio.gather(
+            *(self._run_health_check(name, self.health_checks[name]) for name in names)
+        )
         
-        for name, check_func in self.health_checks.items():
-            try:
-                start_time = time.time()
-                result = await check_func() if asyncio.iscoroutinefunction(check_func) else check_func()
-                duration = time.time() - start_time
-                
-                is_healthy = result.get("healthy", False) if isinstance(result, dict) else bool(result)
-                
-                results[name] = {
-                    "healthy": is_healthy,
-                    "duration": duration,
-                    "details": result if isinstance(result, dict) else {"status": result}
-                }
-                
-                if not is_healthy:
-                    overall_healthy = False
-                
-                # Record metrics
-                self.metrics.record_metric(f"health_check_duration", duration, {"check": name})
-                self.metrics.set_gauge(f"health_check_status", 1 if is_healthy else 0, {"check": name})
-                
-            except Exception as e:
-                results[name] = {
-                    "healthy": False,
-                    "error": str(e),
-                    "duration": 0
-                }
-                overall_healthy = False
-                logger.error(f"Health check {name} failed: {e}")
+        results = dict(zip(names, outcomes))
+        overall_healthy = all(result["healthy"] for result in outcomes)
         
         results["overall"] = {"healthy": overall_healthy}
         return results
+    
+    async def _run_health_check(self, name: str, check_func) -> Dict[str, Any]:
+        """Run one health check, timing it and recording its metrics."""
+        try:
+            start_time = time.monotonic()
+            if asyncio.iscoroutinefunction(check_func):
+                result = await check_func()
+            else:
+                # Keep synchronous checks from blocking the other checks
+                result = await asyncio.get_running_loop().run_in_executor(None, check_func)
+            duration = time.monotonic() - start_time
+            
+            is_healthy = result.get("healthy", False) if isinstance(result, dict) else bool(result)
+            
+            # Record metrics
+            self.metrics.record_metric("health_check_duration", duration, {"check": name})
+            self.metrics.set_gauge("health_check_status", 1 if is_healthy else 0, {"check": name})
+            
+            return {
+                "healthy": is_healthy,
+                "duration": duration,
+                "details": result if isinstance(result, dict) else {"status": result}
+            }
+            
+        except Exception as e:
+            logger.error("Health check %s failed: %s", name, e)
+            return {
+                "healthy": False,
+                "error": str(e),
+                "duration": 0
+            }
 
 
 class AlertManager:
@@ -288,6 +749,9 @@ class AlertManager:
         self.metrics = metrics_collector
         self.alert_rules = []
         self.alert_history = deque(maxlen=100)
+        # Min-heap of (next eligible time, rule index) so rules still in
+        # cooldown are never visited
+        self._rule_heap: List[Tuple[float, int]] = []
     
     def add_alert_rule(self, name: str, condition_func, message: str, cooldown_minutes: int = 5):
         """Add an alert rule."""
@@ -298,24 +762,32 @@ class AlertManager:
             "cooldown": cooldown_minutes * 60,
             "last_triggered": 0
         })
-        logger.debug(f"Added alert rule: {name}")
+        heapq.heappush(self._rule_heap, (0.0, len(self.alert_rules) - 1))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Added alert rule: %s", name)
     
     async def check_alerts(self):
         """Check all alert rules and trigger alerts if needed."""
         current_time = time.time()
         
-        for rule in self.alert_rules:
+        # Pop every rule whose cooldown has elapsed
+        eligible = []
+        while self._rule_heap and self._rule_heap[0][0] <= current_time:
+            eligible.append(heapq.heappop(self._rule_heap)[1])
+        
+        for index in eligible:
+            rule = self.alert_rules[index]
+            next_check = current_time
             try:
-                # Check cooldown
-                if current_time - rule["last_triggered"] < rule["cooldown"]:
-                    continue
-                
                 # Evaluate condition
                 if rule["condition"](self.metrics):
                     await self._trigger_alert(rule, current_time)
+                    next_check = current_time + rule["cooldown"]
                     
             except Exception as e:
-                logger.error(f"Error checking alert rule {rule['name']}: {e}")
+                logger.error("Error checking alert rule %s: %s", rule['name'], e)
+            
+            heapq.heappush(self._rule_heap, (next_check, index))
     
     async def _trigger_alert(self, rule: Dict[str, Any], timestamp: float):
         """Trigger an alert."""
@@ -329,7 +801,7 @@ class AlertManager:
         self.alert_history.append(alert)
         rule["last_triggered"] = timestamp
         
-        logger.warning(f"ALERT: {rule['name']} - {rule['message']}")
+        logger.warning("ALERT: %s - %s", rule['name'], rule['message'])
         
         # Here you could add integrations to send alerts via:
         # - Email
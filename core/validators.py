@@ -1,10 +1,18 @@
 """Input validation and security for Pipecat Agent Builder."""
 
+import functools
+import ipaddress
 import re
 import urllib.parse
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick is optional; dangerous-content checks then use the regex alone
+    ahocorasick = None
+
 from core.config import AgentRequirements, KnowledgeSourceConfig
 from core.exceptions import ValidationError
 from core.logger import setup_logger
@@ -37,9 +45,38 @@ class SecurityValidator:
         r'hasattr',
     ]
     
+    # All dangerous patterns as one alternation, so input is scanned once
+    _DANGEROUS_RE = re.compile('|'.join(DANGEROUS_PATTERNS), re.IGNORECASE)
+    # Names are limited to SAFE_NAME_PATTERN, which has no '(', so only the
+    # patterns without one can match a name
+    _NAME_DANGEROUS_RE = re.compile(
+        '|'.join(p for p in DANGEROUS_PATTERNS if r'\(' not in p), re.IGNORECASE
+    )
+    
+    # Literal prefilter: every pattern starts with a fixed token, so text
+    # without any of them cannot match and skips the regex
+    if ahocorasick is not None:
+        _DANGEROUS_TOKENS = ahocorasick.Automaton()
+        for _pattern in DANGEROUS_PATTERNS:
+            _token = _pattern.replace(r'\s*\(', '').replace('\\', '')
+            _DANGEROUS_TOKENS.add_word(_token, _token)
+        _DANGEROUS_TOKENS.make_automaton()
+        del _pattern, _token
+    else:
+        _DANGEROUS_TOKENS = None
+    
     # Safe characters for names
     SAFE_NAME_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-_\.]+$')
     
+    # Allowed URL scheme prefixes (compared lowercased)
+    ALLOWED_URL_PREFIXES = ('http://', 'https://')
+    
+    # Host names that always resolve to this machine
+    BLOCKED_HOSTNAMES = frozenset({'localhost'})
+    
+    # System directories that file paths may not point into
+    SYSTEM_PATH_PREFIXES = ('/etc', '/usr', '/bin', '/sbin', '/var', '/sys', '/proc')
+    
     @classmethod
     def validate_agent_name(cls, name: str) -> str:
         """Validate agent name for security and format."""
@@ -55,9 +92,8 @@ class SecurityValidator:
             raise ValidationError("Agent name contains invalid characters")
         
         # Check for dangerous patterns
-        for pattern in cls.DANGEROUS_PATTERNS:
-            if re.search(pattern, name, re.IGNORECASE):
-                raise ValidationError(f"Agent name contains potentially dangerous content")
+        if cls._NAME_DANGEROUS_RE.search(name):
+            raise ValidationError(f"Agent name contains potentially dangerous content")
         
         return name
     
@@ -73,36 +109,50 @@ class SecurityValidator:
             raise ValidationError("Description too long (max 1000 characters)")
         
         # Check for dangerous patterns
-        for pattern in cls.DANGEROUS_PATTERNS:
-            if re.search(pattern, description, re.IGNORECASE):
-                raise ValidationError("Description contains potentially dangerous content")
+        if cls._contains_dangerous(description):
+            raise ValidationError("Description contains potentially dangerous content")
         
         return description
     
     @classmethod
+    def _contains_dangerous(cls, text: str) -> bool:
+        """Return True if text matches any of the dangerous patterns."""
+        # Lowercasing only mirrors IGNORECASE for ASCII, so other text
+        # goes straight to the regex
+        if cls._DANGEROUS_TOKENS is not None and text.isascii():
+            if next(cls._DANGEROUS_TOKENS.iter(text.lower()), None) is None:
+                return False
+        return cls._DANGEROUS_RE.search(text) is not None
+    
+    @classmethod
+    @functools.lru_cache(maxsize=4096)
     def validate_url(cls, url: str) -> str:
-        """Validate URL for security."""
+        """Validate URL for security (memoized; invalid URLs are not cached)."""
         try:
-            parsed = urllib.parse.urlparse(url)
+            # Only allow HTTP/HTTPS; a prefix check rejects most bad input
+            # before the URL is parsed at all
+            if not url[:8].lower().startswith(cls.ALLOWED_URL_PREFIXES):
+                raise ValidationError("Only HTTP/HTTPS URLs are allowed")
             
-            # Must have scheme and netloc
-            if not parsed.scheme or not parsed.netloc:
-                raise ValidationError("Invalid URL format")
+            parsed = urllib.parse.urlsplit(url)
             
-            # Only allow HTTP/HTTPS
-            if parsed.scheme not in ['http', 'https']:
-                raise ValidationError("Only HTTP/HTTPS URLs are allowed")
+            # Must have a host
+            if not parsed.netloc:
+                raise ValidationError("Invalid URL format")
             
             # Block localhost and private IPs
             hostname = parsed.hostname
             if hostname:
-                if hostname in ['localhost', '127.0.0.1', '0.0.0.0']:
+                if hostname in cls.BLOCKED_HOSTNAMES:
                     raise ValidationError("Localhost URLs are not allowed")
                 
-                # Block private IP ranges
-                if (hostname.startswith('192.168.') or 
-                    hostname.startswith('10.') or 
-                    hostname.startswith('172.')):
+                # Block private, loopback and other non-public IP addresses
+                try:
+                    ip = ipaddress.ip_address(hostname)
+                except ValueError:
+                    ip = None  # A DNS name
+                if ip is not None and (ip.is_private or ip.is_loopback or ip.is_link_local
+                                       or ip.is_reserved or ip.is_unspecified):
                     raise ValidationError("Private IP addresses are not allowed")
             
             return url
@@ -118,10 +168,8 @@ class SecurityValidator:
             raise ValidationError("Path traversal attempts are not allowed")
         
         # Block system directories
-        dangerous_paths = ['/etc', '/usr', '/bin', '/sbin', '/var', '/sys', '/proc']
-        for dangerous in dangerous_paths:
-            if file_path.startswith(dangerous):
-                raise ValidationError(f"Access to {dangerous} is not allowed")
+        if file_path.startswith(cls.SYSTEM_PATH_PREFIXES):
+            raise ValidationError("Access to system directories is not allowed")
         
         return file_path
 
@@ -129,21 +177,32 @@ class SecurityValidator:
 class RequirementsValidator:
     """Validate agent requirements for completeness and correctness."""
     
-    VALID_CHANNELS = ['phone', 'web', 'mobile', 'whatsapp', 'telegram']
-    VALID_LANGUAGES = ['en', 'es', 'fr', 'de', 'it', 'pt', 'zh', 'ja', 'ko', 'ru', 'ar', 'hi']
-    VALID_USE_CASES = [
+    VALID_CHANNELS = frozenset({'phone', 'web', 'mobile', 'whatsapp', 'telegram'})
+    VALID_LANGUAGES = frozenset({'en', 'es', 'fr', 'de', 'it', 'pt', 'zh', 'ja', 'ko', 'ru', 'ar', 'hi'})
+    VALID_USE_CASES = frozenset({
         'customer_service', 'personal_assistant', 'education', 'healthcare',
         'sales', 'support', 'entertainment', 'business', 'creative', 'other'
-    ]
+    })
+    VALID_KNOWLEDGE_SOURCE_TYPES = frozenset({'web', 'document', 'api', 'database'})
+    VALID_INTEGRATIONS = frozenset({
+        'twilio', 'telnyx', 'plivo', 'exotel',
+        'zendesk', 'salesforce', 'hubspot',
+        'slack', 'teams', 'discord',
+        'whatsapp', 'telegram',
+        'google_calendar', 'outlook',
+        'notion', 'airtable'
+    })
     
     @classmethod
     def validate_requirements(cls, requirements: AgentRequirements) -> AgentRequirements:
         """Validate complete agent requirements."""
         logger.info(f"Validating requirements for agent: {requirements.name}")
         
-        # Validate basic fields
-        requirements.name = SecurityValidator.validate_agent_name(requirements.name)
-        requirements.description = SecurityValidator.validate_description(requirements.description)
+        # Requirements are frozen, so cleaned values go into a validated copy
+        updates = {
+            'name': SecurityValidator.validate_agent_name(requirements.name),
+            'description': SecurityValidator.validate_description(requirements.description),
+        }
         
         # Validate use case
         if requirements.use_case not in cls.VALID_USE_CASES:
@@ -155,7 +214,7 @@ class RequirementsValidator:
                 raise ValidationError(f"Invalid channel: {channel}")
         
         if not requirements.channels:
-            requirements.channels = ['web']  # Default to web
+            updates['channels'] = ['web']  # Default to web
         
         # Validate languages
         for lang in requirements.languages:
@@ -163,7 +222,7 @@ class RequirementsValidator:
                 raise ValidationError(f"Unsupported language: {lang}")
         
         if not requirements.languages:
-            requirements.languages = ['en']  # Default to English
+            updates['languages'] = ['en']  # Default to English
         
         # Validate knowledge sources
         for ks in requirements.knowledge_sources:
@@ -176,7 +235,7 @@ class RequirementsValidator:
         cls._validate_deployment_config(requirements.deployment)
         
         logger.info("Requirements validation completed successfully")
-        return requirements
+        return requirements.model_copy(update=updates)
     
     @classmethod
     def _validate_knowledge_source(cls, ks: KnowledgeSourceConfig):
@@ -185,68 +244,60 @@ class RequirementsValidator:
             SecurityValidator.validate_url(ks.source)
         elif ks.type == 'document':
             SecurityValidator.validate_file_path(ks.source)
-        elif ks.type not in ['web', 'document', 'api', 'database']:
+        elif ks.type not in cls.VALID_KNOWLEDGE_SOURCE_TYPES:
             raise ValidationError(f"Invalid knowledge source type: {ks.type}")
     
     @classmethod
     def _validate_integrations(cls, integrations: List[str]):
         """Validate integration list."""
-        valid_integrations = [
-            'twilio', 'telnyx', 'plivo', 'exotel',
-            'zendesk', 'salesforce', 'hubspot',
-            'slack', 'teams', 'discord',
-            'whatsapp', 'telegram',
-            'google_calendar', 'outlook',
-            'notion', 'airtable'
-        ]
-        
         for integration in integrations:
-            if integration not in valid_integrations:
+            if integration not in cls.VALID_INTEGRATIONS:
                 logger.warning(f"Unknown integration: {integration}")
     
     @classmethod
     def _validate_deployment_config(cls, deployment):
         """Validate deployment configuration."""
-        if deployment.scaling_min < 0:
+        scaling_min, scaling_max = deployment.scaling_min, deployment.scaling_max
+        if 0 <= scaling_min <= scaling_max <= 100:
+            return
+        
+        # Out of range; report the specific problem
+        if scaling_min < 0:
             raise ValidationError("Minimum scaling cannot be negative")
         
-        if deployment.scaling_max < deployment.scaling_min:
+        if scaling_max < scaling_min:
             raise ValidationError("Maximum scaling cannot be less than minimum")
         
-        if deployment.scaling_max > 100:
-            raise ValidationError("Maximum scaling too high (limit: 100)")
+        raise ValidationError("Maximum scaling too high (limit: 100)")
 
 
 class APIKeyValidator:
     """Validate API keys and service configurations."""
     
+    # Required keys and the prefix each must carry
+    REQUIRED_KEYS = (
+        ('openai_api_key', 'sk-'),
+        ('deepgram_api_key', None),  # No standard prefix
+        ('cartesia_api_key', None),
+    )
+    # Languages Deepgram handles well
+    DEEPGRAM_LANGUAGES = frozenset({'en', 'es', 'fr', 'de'})
+    # Integrations that can carry the phone channel
+    TELEPHONY_INTEGRATIONS = frozenset({'twilio', 'telnyx', 'plivo'})
+    
     @classmethod
     def validate_api_keys(cls, settings) -> Dict[str, bool]:
         """Validate all configured API keys."""
         results = {}
         
-        # Required keys
-        required_keys = {
-            'openai_api_key': 'sk-',
-            'deepgram_api_key': None,  # No standard prefix
-            'cartesia_api_key': None,
-        }
-        
-        for key_name, prefix in required_keys.items():
+        for key_name, prefix in cls.REQUIRED_KEYS:
             key_value = getattr(settings, key_name, None)
-            if not key_value:
-                results[key_name] = False
-                continue
-            
-            if prefix and not key_value.startswith(prefix):
-                results[key_name] = False
-                continue
-            
-            if len(key_value) < 10:  # Minimum reasonable length
-                results[key_name] = False
-                continue
-            
-            results[key_name] = True
+            # Present, carrying the expected prefix, and of a reasonable length
+            results[key_name] = bool(
+                key_value
+                and (not prefix or key_value.startswith(prefix))
+                and len(key_value) >= 10
+            )
         
         return results
     
@@ -258,12 +309,12 @@ class APIKeyValidator:
         # Check language support
         if requirements.stt_service and requirements.languages:
             primary_lang = requirements.languages[0]
-            if primary_lang not in ['en', 'es', 'fr', 'de'] and requirements.stt_service.provider == 'deepgram':
+            if primary_lang not in cls.DEEPGRAM_LANGUAGES and requirements.stt_service.provider == 'deepgram':
                 warnings.append(f"Deepgram may have limited support for language: {primary_lang}")
         
         # Check channel compatibility
         if 'phone' in requirements.channels:
-            if not any(integration in requirements.integrations for integration in ['twilio', 'telnyx', 'plivo']):
+            if cls.TELEPHONY_INTEGRATIONS.isdisjoint(requirements.integrations):
                 warnings.append("Phone channel requires telephony integration (Twilio, Telnyx, or Plivo)")
         
         return warnings
@@ -292,6 +343,21 @@ class ResourceValidator:
     @classmethod
     def estimate_resource_usage(cls, requirements: AgentRequirements) -> Dict[str, Any]:
         """Estimate resource usage for the agent."""
+        # The estimate depends only on these counts, so equal shapes share one result
+        estimate = cls._estimate_for_counts(
+            len(requirements.channels),
+            len(requirements.languages),
+            len(requirements.knowledge_sources),
+            len(requirements.integrations),
+            'phone' in requirements.channels,
+        )
+        return dict(estimate)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _estimate_for_counts(channels: int, languages: int, knowledge_sources: int,
+                             integrations: int, has_phone: bool) -> Dict[str, Any]:
+        """Compute the resource estimate from feature counts (memoized)."""
         
         # Base resource usage
         cpu_units = 1.0
@@ -299,17 +365,17 @@ class ResourceValidator:
         storage_mb = 100
         
         # Adjust based on features
-        cpu_units += len(requirements.languages) * 0.2
-        cpu_units += len(requirements.knowledge_sources) * 0.3
-        cpu_units += len(requirements.integrations) * 0.1
+        cpu_units += languages * 0.2
+        cpu_units += knowledge_sources * 0.3
+        cpu_units += integrations * 0.1
         
-        memory_mb += len(requirements.knowledge_sources) * 100
-        memory_mb += len(requirements.languages) * 50
+        memory_mb += knowledge_sources * 100
+        memory_mb += languages * 50
         
-        storage_mb += len(requirements.knowledge_sources) * 200
+        storage_mb += knowledge_sources * 200
         
         # Adjust for channels
-        if 'phone' in requirements.channels:
+        if has_phone:
             cpu_units += 0.5
             memory_mb += 200
         
@@ -317,18 +383,31 @@ class ResourceValidator:
             'estimated_cpu_units': round(cpu_units, 2),
             'estimated_memory_mb': int(memory_mb),
             'estimated_storage_mb': int(storage_mb),
-            'complexity_score': cls._calculate_complexity(requirements)
+            'complexity_score': ResourceValidator._complexity_for_counts(
+                channels, languages, knowledge_sources, integrations
+            )
         }
     
     @classmethod
     def _calculate_complexity(cls, requirements: AgentRequirements) -> str:
         """Calculate complexity score for the agent."""
+        return cls._complexity_for_counts(
+            len(requirements.channels),
+            len(requirements.languages),
+            len(requirements.knowledge_sources),
+            len(requirements.integrations),
+        )
+    
+    @staticmethod
+    def _complexity_for_counts(channels: int, languages: int, knowledge_sources: int,
+                               integrations: int) -> str:
+        """Map feature counts to a complexity score."""
         score = 0
         
-        score += len(requirements.channels)
-        score += len(requirements.languages) * 2
-        score += len(requirements.knowledge_sources) * 3
-        score += len(requirements.integrations) * 2
+        score += channels
+        score += languages * 2
+        score += knowledge_sources * 3
+        score += integrations * 2
         
         if score <= 5:
             return "simple"
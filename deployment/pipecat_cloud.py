@@ -1,13 +1,12 @@
 """Pipecat Cloud deployment automation."""
 
 import asyncio
+import logging
 import subprocess
 import json
 from pathlib import Path
 from typing import Dict, Any, Optional
 import aiohttp
-import docker
-from docker.errors import DockerException
 
 from core.config import AgentRequirements, settings
 from core.logger import setup_logger
@@ -15,32 +14,72 @@ from core.logger import setup_logger
 logger = setup_logger("pipecat_cloud")
 
 
+# Secret set entries: environment variable name -> settings attribute
+_SECRETS_MAP = (
+    ("OPENAI_API_KEY", "openai_api_key"),
+    ("DEEPGRAM_API_KEY", "deepgram_api_key"),
+    ("CARTESIA_API_KEY", "cartesia_api_key"),
+    ("ELEVENLABS_API_KEY", "elevenlabs_api_key"),
+    ("DAILY_API_KEY", "daily_api_key"),
+)
+
+# Spaces and underscores both become hyphens in a slug
+_SLUG_TABLE = str.maketrans(' _', '--')
+
+
+def _slug(name: str) -> str:
+    """Return the agent name as used for image, agent and secret set names."""
+    return name.lower().translate(_SLUG_TABLE)
+
+
 class PipecatCloudDeployer:
     """Handle deployment to Pipecat Cloud."""
     
     def __init__(self):
         self.docker_client = None
         self.pipecat_api_base = "https://api.pipecat.daily.co/v1"
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared Pipecat Cloud API session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={"Authorization": f"Bearer {settings.pipecat_cloud_api_key}"},
+                timeout=aiohttp.ClientTimeout(total=60)
+            )
+        return self._session
+    
+    async def aclose(self):
+        """Close the shared API session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
         
     async def deploy_agent(self, requirements: AgentRequirements, agent_dir: Path) -> Dict[str, Any]:
         """Deploy agent to Pipecat Cloud."""
         logger.info(f"Starting deployment of {requirements.name}")
+        agent_name = _slug(requirements.name)
         
         try:
             # Step 1: Initialize Docker client
             await self._init_docker()
             
             # Step 2: Build Docker image
-            image_tag = await self._build_docker_image(requirements, agent_dir)
+            image_tag = await self._build_docker_image(agent_name, agent_dir)
             
-            # Step 3: Push to registry
-            await self._push_docker_image(image_tag)
-            
-            # Step 4: Upload secrets
-            await self._upload_secrets(requirements)
+            # Steps 3 and 4: push to registry while uploading secrets; the
+            # two are independent, and the cloud deploy needs both
+            push_task = asyncio.create_task(self._push_docker_image(image_tag))
+            secrets_task = asyncio.create_task(self._upload_secrets(agent_name))
+            try:
+                await asyncio.gather(push_task, secrets_task)
+            except BaseException:
+                push_task.cancel()
+                secrets_task.cancel()
+                raise
             
             # Step 5: Deploy to Pipecat Cloud
-            deployment_result = await self._deploy_to_cloud(requirements, image_tag)
+            deployment_result = await self._deploy_to_cloud(requirements, agent_name, image_tag)
             
             logger.info("Deployment completed successfully")
             return {
@@ -56,38 +95,33 @@ class PipecatCloudDeployer:
                 "status": "failed",
                 "error": str(e)
             }
+        
+        finally:
+            await self.aclose()
     
     async def _init_docker(self):
         """Initialize Docker client."""
+        # The Docker SDK is a large import, only needed once a deploy starts
+        import docker
+        from docker.errors import DockerException
+        
         try:
-            self.docker_client = docker.from_env()
+            # The Docker SDK is blocking, so it runs off the event loop
+            self.docker_client = await asyncio.to_thread(docker.from_env)
             # Test Docker connection
-            self.docker_client.ping()
+            await asyncio.to_thread(self.docker_client.ping)
             logger.info("Docker client initialized successfully")
         except DockerException as e:
             raise Exception(f"Docker not available or not running: {e}")
     
-    async def _build_docker_image(self, requirements: AgentRequirements, agent_dir: Path) -> str:
+    async def _build_docker_image(self, agent_name: str, agent_dir: Path) -> str:
         """Build Docker image for the agent."""
-        agent_name = requirements.name.lower().replace(' ', '-').replace('_', '-')
         image_tag = f"{settings.docker_hub_username}/{agent_name}:latest"
         
         logger.info(f"Building Docker image: {image_tag}")
         
         try:
-            # Build image
-            image, build_logs = self.docker_client.images.build(
-                path=str(agent_dir),
-                tag=image_tag,
-                rm=True,
-                pull=True
-            )
-            
-            # Log build output
-            for log in build_logs:
-                if 'stream' in log:
-                    logger.debug(log['stream'].strip())
-            
+            await asyncio.to_thread(self._build_image_sync, agent_dir, image_tag)
             logger.info(f"Docker image built successfully: {image_tag}")
             return image_tag
             
@@ -99,93 +133,101 @@ class PipecatCloudDeployer:
         logger.info(f"Pushing Docker image: {image_tag}")
         
         try:
-            # Login to Docker Hub if credentials provided
-            if settings.docker_hub_username and settings.docker_hub_token:
-                self.docker_client.login(
-                    username=settings.docker_hub_username,
-                    password=settings.docker_hub_token
-                )
-            
-            # Push image
-            push_logs = self.docker_client.images.push(
-                image_tag,
-                stream=True,
-                decode=True
-            )
-            
-            # Log push output
-            for log in push_logs:
-                if 'status' in log:
-                    logger.debug(f"Push: {log['status']}")
-                if 'error' in log:
-                    raise Exception(f"Push error: {log['error']}")
-            
+            await asyncio.to_thread(self._push_image_sync, image_tag)
             logger.info(f"Docker image pushed successfully: {image_tag}")
             
         except Exception as e:
             raise Exception(f"Docker push failed: {e}")
     
-    async def _upload_secrets(self, requirements: AgentRequirements):
+    def _build_image_sync(self, agent_dir: Path, image_tag: str):
+        """Build the image and log its output; blocking, run in a worker thread."""
+        image, build_logs = self.docker_client.images.build(
+            path=str(agent_dir),
+            tag=image_tag,
+            rm=True,
+            pull=True
+        )
+        
+        # Log build output; skip the per-line work when DEBUG is off
+        if logger.isEnabledFor(logging.DEBUG):
+            for log in build_logs:
+                if 'stream' in log:
+                    logger.debug(log['stream'].rstrip())
+    
+    def _push_image_sync(self, image_tag: str):
+        """Log in if needed and push the image; blocking, run in a worker thread."""
+        # Login to Docker Hub if credentials provided
+        if settings.docker_hub_username and settings.docker_hub_token:
+            self.docker_client.login(
+                username=settings.docker_hub_username,
+                password=settings.docker_hub_token
+            )
+        
+        # Push image; the stream is consumed here, in the same thread
+        push_logs = self.docker_client.images.push(
+            image_tag,
+            stream=True,
+            decode=True
+        )
+        
+        # Log push output; errors are checked at every level
+        debug_on = logger.isEnabledFor(logging.DEBUG)
+        for log in push_logs:
+            if debug_on and 'status' in log:
+                logger.debug("Push: %s", log['status'])
+            if 'error' in log:
+                raise Exception(f"Push error: {log['error']}")
+    
+    async def _upload_secrets(self, agent_name: str):
         """Upload secrets to Pipecat Cloud."""
         if not settings.pipecat_cloud_api_key:
             logger.warning("No Pipecat Cloud API key provided, skipping secrets upload")
             return
         
-        secret_set_name = f"{requirements.name.lower().replace(' ', '-')}-secrets"
+        secret_set_name = f"{agent_name}-secrets"
         
-        # Prepare secrets
+        # Prepare secrets, leaving out any that are not configured
         secrets = {
-            "OPENAI_API_KEY": settings.openai_api_key,
-            "DEEPGRAM_API_KEY": settings.deepgram_api_key,
-            "CARTESIA_API_KEY": settings.cartesia_api_key,
+            env_var: value
+            for env_var, attr in _SECRETS_MAP
+            if (value := getattr(settings, attr, None))
         }
-        
-        # Add optional secrets
-        if settings.elevenlabs_api_key:
-            secrets["ELEVENLABS_API_KEY"] = settings.elevenlabs_api_key
-        if settings.daily_api_key:
-            secrets["DAILY_API_KEY"] = settings.daily_api_key
+        # The auth token is unusable without its account SID, so Twilio
+        # credentials are only uploaded together with the SID
         if settings.twilio_account_sid:
             secrets["TWILIO_ACCOUNT_SID"] = settings.twilio_account_sid
-            secrets["TWILIO_AUTH_TOKEN"] = settings.twilio_auth_token
-        
-        # Filter out None values
-        secrets = {k: v for k, v in secrets.items() if v is not None}
+            if settings.twilio_auth_token:
+                secrets["TWILIO_AUTH_TOKEN"] = settings.twilio_auth_token
         
         logger.info(f"Uploading {len(secrets)} secrets to secret set: {secret_set_name}")
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {settings.pipecat_cloud_api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                payload = {
-                    "secret_set_name": secret_set_name,
-                    "secrets": secrets
-                }
-                
-                async with session.post(
-                    f"{self.pipecat_api_base}/secrets",
-                    headers=headers,
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        logger.info("Secrets uploaded successfully")
-                    else:
-                        error_text = await response.text()
-                        logger.warning(f"Secrets upload failed: {response.status} - {error_text}")
+            session = await self._get_session()
+            
+            payload = {
+                "secret_set_name": secret_set_name,
+                "secrets": secrets
+            }
+            
+            async with session.post(
+                f"{self.pipecat_api_base}/secrets",
+                json=payload
+            ) as response:
+                if response.status == 200:
+                    logger.info("Secrets uploaded successfully")
+                else:
+                    error_text = await response.text()
+                    logger.warning(f"Secrets upload failed: {response.status} - {error_text}")
         
         except Exception as e:
             logger.warning(f"Failed to upload secrets: {e}")
     
-    async def _deploy_to_cloud(self, requirements: AgentRequirements, image_tag: str) -> Dict[str, Any]:
+    async def _deploy_to_cloud(self, requirements: AgentRequirements, agent_name: str,
+                               image_tag: str) -> Dict[str, Any]:
         """Deploy agent to Pipecat Cloud."""
         if not settings.pipecat_cloud_api_key:
             raise Exception("Pipecat Cloud API key required for deployment")
         
-        agent_name = requirements.name.lower().replace(' ', '-').replace('_', '-')
         secret_set_name = f"{agent_name}-secrets"
         
         deployment_config = {
@@ -205,25 +247,20 @@ class PipecatCloudDeployer:
         logger.info(f"Deploying agent with config: {deployment_config}")
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {settings.pipecat_cloud_api_key}",
-                    "Content-Type": "application/json"
-                }
+            session = await self._get_session()
+            
+            async with session.post(
+                f"{self.pipecat_api_base}/agents",
+                json=deployment_config
+            ) as response:
                 
-                async with session.post(
-                    f"{self.pipecat_api_base}/agents",
-                    headers=headers,
-                    json=deployment_config
-                ) as response:
-                    
-                    response_data = await response.json()
-                    
-                    if response.status == 200 or response.status == 201:
-                        logger.info("Agent deployed successfully to Pipecat Cloud")
-                        return response_data
-                    else:
-                        raise Exception(f"Deployment failed: {response.status} - {response_data}")
+                response_data = await response.json()
+                
+                if response.status == 200 or response.status == 201:
+                    logger.info("Agent deployed successfully to Pipecat Cloud")
+                    return response_data
+                else:
+                    raise Exception(f"Deployment failed: {response.status} - {response_data}")
         
         except Exception as e:
             raise Exception(f"Pipecat Cloud deployment failed: {e}")
@@ -234,21 +271,17 @@ class PipecatCloudDeployer:
             raise Exception("Pipecat Cloud API key required")
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {settings.pipecat_cloud_api_key}"
-                }
+            session = await self._get_session()
+            
+            async with session.get(
+                f"{self.pipecat_api_base}/agents/{agent_name}"
+            ) as response:
                 
-                async with session.get(
-                    f"{self.pipecat_api_base}/agents/{agent_name}",
-                    headers=headers
-                ) as response:
-                    
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        error_text = await response.text()
-                        raise Exception(f"Status check failed: {response.status} - {error_text}")
+                if response.status == 200:
+                    return await response.json()
+                else:
+                    error_text = await response.text()
+                    raise Exception(f"Status check failed: {response.status} - {error_text}")
         
         except Exception as e:
             raise Exception(f"Failed to get deployment status: {e}")
@@ -294,4 +327,7 @@ async def deploy_agent_to_cloud(requirements: AgentRequirements, agent_dir: Path
 async def check_deployment_status(agent_name: str) -> Dict[str, Any]:
     """Check deployment status on Pipecat Cloud."""
     deployer = PipecatCloudDeployer()
-    return await deployer.get_deployment_status(agent_name)
+    try:
+        return await deployer.get_deployment_status(agent_name)
+    finally:
+        await deployer.aclose()
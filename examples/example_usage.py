@@ -9,6 +9,7 @@ through the conversational interface.
 import asyncio
 import sys
 from pathlib import Path
+from typing import Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -22,189 +23,222 @@ from deployment.pipecat_cloud import PipecatCloudDeployer
 
 logger = setup_logger("example_usage")
 
+# Knowledge search results keyed by (query, n_results), shared across builds
+_search_cache: dict[tuple[str, int], list] = {}
 
-async def example_customer_service_bot():
-    """Example: Build a customer service bot programmatically."""
+# Example requirements are static, so they are built once at import
+_CUSTOMER_SERVICE_REQUIREMENTS = AgentRequirements(
+    name="Customer Service Assistant",
+    description="A helpful customer service agent that can handle inquiries, access FAQ database, and escalate to human agents when needed.",
+    use_case="customer_service",
+    channels=["phone", "web"],
+    languages=["en", "es"],
+    personality="professional, empathetic, and solution-oriented",
     
-    logger.info("Building customer service bot example...")
+    # AI service preferences
+    stt_service=AIServiceConfig(
+        name="deepgram",
+        provider="deepgram",
+        model="nova-2",
+        language="en"
+    ),
+    llm_service=AIServiceConfig(
+        name="openai",
+        provider="openai",
+        model="gpt-4o"
+    ),
+    tts_service=AIServiceConfig(
+        name="cartesia",
+        provider="cartesia",
+        voice_id="71a7ad14-091c-4e8e-a314-022ece01c121"
+    ),
     
-    # Define agent requirements
-    requirements = AgentRequirements(
-        name="Customer Service Assistant",
-        description="A helpful customer service agent that can handle inquiries, access FAQ database, and escalate to human agents when needed.",
-        use_case="customer_service",
-        channels=["phone", "web"],
-        languages=["en", "es"],
-        personality="professional, empathetic, and solution-oriented",
-        
-        # AI service preferences
-        stt_service=AIServiceConfig(
-            name="deepgram",
-            provider="deepgram",
-            model="nova-2",
-            language="en"
-        ),
-        llm_service=AIServiceConfig(
-            name="openai",
-            provider="openai",
-            model="gpt-4o"
-        ),
-        tts_service=AIServiceConfig(
-            name="cartesia",
-            provider="cartesia",
-            voice_id="71a7ad14-091c-4e8e-a314-022ece01c121"
+    # Knowledge sources
+    knowledge_sources=[
+        KnowledgeSourceConfig(
+            type="web",
+            source="https://help.yourcompany.com",
+            processing_options={"crawl_depth": 2}
         ),
-        
-        # Knowledge sources
-        knowledge_sources=[
-            KnowledgeSourceConfig(
-                type="web",
-                source="https://help.yourcompany.com",
-                processing_options={"crawl_depth": 2}
-            ),
-            KnowledgeSourceConfig(
-                type="document",
-                source="faq_database.pdf",
-                processing_options={"format": "faq"}
-            )
-        ],
-        
-        # Integrations
-        integrations=["zendesk", "twilio"],
-        
-        # Deployment configuration
-        deployment=DeploymentConfig(
-            platform="pipecat-cloud",
-            scaling_min=2,
-            scaling_max=10,
-            region="us-west-2",
-            environment="production"
+        KnowledgeSourceConfig(
+            type="document",
+            source="faq_database.pdf",
+            processing_options={"format": "faq"}
         )
-    )
+    ],
     
-    return requirements
+    # Integrations
+    integrations=["zendesk", "twilio"],
+    
+    # Deployment configuration
+    deployment=DeploymentConfig(
+        platform="pipecat-cloud",
+        scaling_min=2,
+        scaling_max=10,
+        region="us-west-2",
+        environment="production"
+    )
+)
 
 
-async def example_personal_assistant():
-    """Example: Build a personal assistant bot."""
+_PERSONAL_ASSISTANT_REQUIREMENTS = AgentRequirements(
+    name="Personal AI Assistant",
+    description="A smart personal assistant that helps with scheduling, answers questions, and manages daily tasks.",
+    use_case="personal_assistant",
+    channels=["web", "mobile"],
+    languages=["en"],
+    personality="friendly, proactive, and organized",
     
-    logger.info("Building personal assistant example...")
+    # High-quality services for personal use
+    stt_service=AIServiceConfig(
+        name="openai",
+        provider="openai",
+        model="whisper-1"
+    ),
+    llm_service=AIServiceConfig(
+        name="openai",
+        provider="openai",
+        model="gpt-4o"
+    ),
+    tts_service=AIServiceConfig(
+        name="elevenlabs",
+        provider="elevenlabs",
+        voice_id="pNInz6obpgDQGcFmaJgB"  # Premium voice
+    ),
     
-    requirements = AgentRequirements(
-        name="Personal AI Assistant",
-        description="A smart personal assistant that helps with scheduling, answers questions, and manages daily tasks.",
-        use_case="personal_assistant",
-        channels=["web", "mobile"],
-        languages=["en"],
-        personality="friendly, proactive, and organized",
-        
-        # High-quality services for personal use
-        stt_service=AIServiceConfig(
-            name="openai",
-            provider="openai",
-            model="whisper-1"
+    # Personal knowledge sources
+    knowledge_sources=[
+        KnowledgeSourceConfig(
+            type="document",
+            source="personal_notes.md",
+            processing_options={"format": "markdown"}
         ),
-        llm_service=AIServiceConfig(
-            name="openai",
-            provider="openai",
-            model="gpt-4o"
-        ),
-        tts_service=AIServiceConfig(
-            name="elevenlabs",
-            provider="elevenlabs",
-            voice_id="pNInz6obpgDQGcFmaJgB"  # Premium voice
+        KnowledgeSourceConfig(
+            type="api",
+            source="calendar_api",
+            processing_options={"endpoint": "https://api.calendar.com/v1"}
+        )
+    ],
+    
+    # Personal integrations
+    integrations=["google_calendar", "slack", "notion"],
+    
+    deployment=DeploymentConfig(
+        scaling_min=1,
+        scaling_max=3,
+        environment="development"
+    )
+)
+
+
+_EDUCATIONAL_TUTOR_REQUIREMENTS = AgentRequirements(
+    name="Math Tutor AI",
+    description="An intelligent math tutor that helps students learn algebra, geometry, and calculus with personalized explanations.",
+    use_case="education",
+    channels=["web"],
+    languages=["en", "es", "fr"],
+    personality="patient, encouraging, and pedagogical",
+    
+    # Education-optimized services
+    stt_service=AIServiceConfig(
+        name="deepgram",
+        provider="deepgram",
+        model="nova-2"
+    ),
+    llm_service=AIServiceConfig(
+        name="anthropic",
+        provider="anthropic",
+        model="claude-3-sonnet-20240229"  # Good for educational content
+    ),
+    tts_service=AIServiceConfig(
+        name="cartesia",
+        provider="cartesia",
+        voice_id="teacher_voice_id"
+    ),
+    
+    # Educational knowledge sources
+    knowledge_sources=[
+        KnowledgeSourceConfig(
+            type="web",
+            source="https://www.khanacademy.org/math",
+            processing_options={"subject": "mathematics"}
         ),
-        
-        # Personal knowledge sources
-        knowledge_sources=[
-            KnowledgeSourceConfig(
-                type="document",
-                source="personal_notes.md",
-                processing_options={"format": "markdown"}
-            ),
-            KnowledgeSourceConfig(
-                type="api",
-                source="calendar_api",
-                processing_options={"endpoint": "https://api.calendar.com/v1"}
-            )
-        ],
-        
-        # Personal integrations
-        integrations=["google_calendar", "slack", "notion"],
-        
-        deployment=DeploymentConfig(
-            scaling_min=1,
-            scaling_max=3,
-            environment="development"
+        KnowledgeSourceConfig(
+            type="document",
+            source="math_curriculum.pdf",
+            processing_options={"format": "educational"}
         )
+    ],
+    
+    integrations=["khan_academy", "wolfram_alpha"],
+    
+    deployment=DeploymentConfig(
+        scaling_min=1,
+        scaling_max=5,
+        region="us-east-1"
     )
+)
+
+
+def example_customer_service_bot() -> AgentRequirements:
+    """Example: Build a customer service bot programmatically."""
     
-    return requirements
+    logger.info("Building customer service bot example...")
+    
+    return _CUSTOMER_SERVICE_REQUIREMENTS
 
 
-async def example_educational_tutor():
+def example_personal_assistant() -> AgentRequirements:
+    """Example: Build a personal assistant bot."""
+    
+    logger.info("Building personal assistant example...")
+    
+    return _PERSONAL_ASSISTANT_REQUIREMENTS
+
+
+def example_educational_tutor() -> AgentRequirements:
     """Example: Build an educational tutor bot."""
     
     logger.info("Building educational tutor example...")
     
-    requirements = AgentRequirements(
-        name="Math Tutor AI",
-        description="An intelligent math tutor that helps students learn algebra, geometry, and calculus with personalized explanations.",
-        use_case="education",
-        channels=["web"],
-        languages=["en", "es", "fr"],
-        personality="patient, encouraging, and pedagogical",
-        
-        # Education-optimized services
-        stt_service=AIServiceConfig(
-            name="deepgram",
-            provider="deepgram",
-            model="nova-2"
-        ),
-        llm_service=AIServiceConfig(
-            name="anthropic",
-            provider="anthropic",
-            model="claude-3-sonnet-20240229"  # Good for educational content
-        ),
-        tts_service=AIServiceConfig(
-            name="cartesia",
-            provider="cartesia",
-            voice_id="teacher_voice_id"
-        ),
-        
-        # Educational knowledge sources
-        knowledge_sources=[
-            KnowledgeSourceConfig(
-                type="web",
-                source="https://www.khanacademy.org/math",
-                processing_options={"subject": "mathematics"}
-            ),
-            KnowledgeSourceConfig(
-                type="document",
-                source="math_curriculum.pdf",
-                processing_options={"format": "educational"}
-            )
-        ],
-        
-        integrations=["khan_academy", "wolfram_alpha"],
-        
-        deployment=DeploymentConfig(
-            scaling_min=1,
-            scaling_max=5,
-            region="us-east-1"
-        )
-    )
+    return _EDUCATIONAL_TUTOR_REQUIREMENTS
+
+
+def _knowledge_queries(requirements: AgentRequirements) -> list[str]:
+    """Knowledge base queries used to find relevant patterns for an agent."""
+    return [
+        f"{requirements.use_case} pipecat example",
+        f"pipecat {' '.join(requirements.channels)} transport",
+        f"{requirements.stt_service.provider} speech to text",
+        f"{requirements.llm_service.provider} language model",
+        f"{requirements.tts_service.provider} text to speech"
+    ]
+
+
+async def _search_cached(vectorizer: PipecatDocumentationVectorizer, queries: list[str], n_results: int = 2) -> list[list]:
+    """Search the knowledge base, only querying for results not cached yet."""
+    missing = list(dict.fromkeys(q for q in queries if (q, n_results) not in _search_cache))
+    if missing:
+        # One batched query embeds and searches all of them together
+        batched = await vectorizer.search_many(missing, n_results=n_results)
+        for query, results in zip(missing, batched):
+            _search_cache[(query, n_results)] = results
     
-    return requirements
+    return [_search_cache[(query, n_results)] for query in queries]
 
 
-async def build_agent_programmatically(requirements: AgentRequirements):
-    """Build an agent using the programmatic API."""
+async def build_agent_programmatically(requirements: AgentRequirements,
+                                       vectorizer: Optional[PipecatDocumentationVectorizer] = None):
+    """Build an agent using the programmatic API.
+    
+    Pass ``vectorizer`` to reuse one already loaded across several builds.
+    """
     
     logger.info(f"Building agent: {requirements.name}")
     
     # Step 1: Initialize components
-    vectorizer = PipecatDocumentationVectorizer()
+    if vectorizer is None:
+        vectorizer = PipecatDocumentationVectorizer()
     template_generator = PipecatTemplateGenerator()
     deployer = PipecatCloudDeployer()
     
@@ -213,16 +247,7 @@ async def build_agent_programmatically(requirements: AgentRequirements):
     knowledge_context = []
     
     # Search for relevant patterns
-    search_queries = [
-        f"{requirements.use_case} pipecat example",
-        f"pipecat {' '.join(requirements.channels)} transport",
-        f"{requirements.stt_service.provider} speech to text",
-        f"{requirements.llm_service.provider} language model",
-        f"{requirements.tts_service.provider} text to speech"
-    ]
-    
-    for query in search_queries:
-        results = await vectorizer.search(query, n_results=2)
+    for results in await _search_cached(vectorizer, _knowledge_queries(requirements)):
         knowledge_context.extend(results)
     
     logger.info(f"Found {len(knowledge_context)} relevant knowledge chunks")
@@ -247,10 +272,11 @@ async def build_agent_programmatically(requirements: AgentRequirements):
     output_dir = Path("generated_agents") / agent_name
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    for filename, content in generated_files.items():
-        file_path = output_dir / filename
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+    # Write all files concurrently, encoding up front instead of per text write
+    await asyncio.gather(*[
+        asyncio.to_thread((output_dir / filename).write_bytes, content.encode('utf-8'))
+        for filename, content in generated_files.items()
+    ])
     
     logger.info(f"Agent saved to: {output_dir}")
     
@@ -287,15 +313,23 @@ async def main():
     
     if choice == "all":
         # Build all examples
-        for name, example_func in examples.values():
+        all_requirements = [(name, example_func()) for name, example_func in examples.values()]
+        
+        # Search every example's queries up front so overlapping ones run once
+        vectorizer = PipecatDocumentationVectorizer()
+        await _search_cached(
+            vectorizer,
+            [query for _, requirements in all_requirements for query in _knowledge_queries(requirements)]
+        )
+        
+        for name, requirements in all_requirements:
             print(f"\n🏗️  Building {name}...")
-            requirements = await example_func()
-            await build_agent_programmatically(requirements)
+            await build_agent_programmatically(requirements, vectorizer)
     elif choice in examples:
         # Build selected example
         name, example_func = examples[choice]
         print(f"\n🏗️  Building {name}...")
-        requirements = await example_func()
+        requirements = example_func()
         await build_agent_programmatically(requirements)
     else:
         print("Invalid choice. Exiting.")
@@ -2,6 +2,8 @@
 
 import asyncio
 import json
+import re
+from collections import deque
 from typing import Dict, Any, List, Optional, AsyncGenerator
 from enum import Enum
 from dataclasses import dataclass, asdict
@@ -21,11 +23,86 @@ from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.services.cartesia.tts import CartesiaTTSService
 from pipecat.transports.network.small_webrtc import SmallWebRTCTransport, SmallWebRTCTransportParams
 
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick is optional; keyword scans fall back to substring checks
+    ahocorasick = None
+
 from core.config import AgentRequirements, AIServiceConfig, DeploymentConfig, KnowledgeSourceConfig, settings
 from core.logger import setup_logger
 
 logger = setup_logger("conversation_interface")
 
+# Agent name phrasings, tried in order ("call it X", "name it X", ...)
+_NAME_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'call it ["\']?([^"\']+)["\']?',
+    r'name it ["\']?([^"\']+)["\']?',
+    r'named? ["\']?([^"\']+)["\']?',
+    r'["\']([^"\']+)["\']',
+))
+# The $-_ range covers digits, uppercase and URL punctuation
+_URL_PATTERN = re.compile(r'https?://[a-z!$-_]+')
+
+
+class _KeywordScanner:
+    """Find which labels' keywords occur in lowercased text, in one pass."""
+    
+    def __init__(self, groups: Dict[str, tuple]):
+        self.groups = groups
+        self.automaton = None
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for label, words in groups.items():
+                for word in words:
+                    self.automaton.add_word(word, label)
+            self.automaton.make_automaton()
+    
+    def find(self, text_lower: str) -> List[str]:
+        """Return the matched labels in the order they were declared."""
+        if self.automaton is not None:
+            found = {label for _, label in self.automaton.iter(text_lower)}
+            return [label for label in self.groups if label in found]
+        return [
+            label for label, words in self.groups.items()
+            if any(word in text_lower for word in words)
+        ]
+
+
+# Keywords for each extracted value; labels are listed in output order
+_CHANNEL_KEYWORDS = _KeywordScanner({
+    "phone": ("phone", "call", "telephone", "dial"),
+    "web": ("web", "website", "browser", "online"),
+    "mobile": ("mobile", "app", "ios", "android"),
+})
+_LANGUAGE_KEYWORDS = _KeywordScanner({
+    "es": ("spanish",),
+    "fr": ("french",),
+    "de": ("german",),
+    "it": ("italian",),
+    "pt": ("portuguese",),
+    "zh": ("chinese",),
+    "ja": ("japanese",),
+    "ko": ("korean",),
+    "ru": ("russian",),
+    "ar": ("arabic",),
+})
+_KNOWLEDGE_SOURCE_KEYWORDS = _KeywordScanner({
+    "web": ("website", "url", "web", "scrape"),
+    "document": ("faq", "knowledge base", "documentation", "docs"),
+    "api": ("api", "database", "system"),
+})
+_INTEGRATION_KEYWORDS = _KeywordScanner({
+    "twilio": ("twilio",),
+    "zendesk": ("zendesk",),
+    "salesforce": ("salesforce",),
+    "slack": ("slack",),
+    "microsoft_teams": ("teams",),
+    "discord": ("discord",),
+    "whatsapp": ("whatsapp",),
+    "telegram": ("telegram",),
+})
+
 
 class ConversationState(Enum):
     """States of the requirements gathering conversation."""
@@ -43,7 +120,7 @@ class ConversationState(Enum):
     COMPLETE = "complete"
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationProgress:
     """Track conversation progress and gathered information."""
     state: ConversationState = ConversationState.GREETING
@@ -70,10 +147,28 @@ class ConversationProgress:
 class RequirementsProcessor(FrameProcessor):
     """Process user input to extract agent requirements."""
     
+    __slots__ = ("progress", "conversation_history", "_loop", "_cached_requirements", "_state_handlers")
+    
+    # Oldest turns are dropped past this many
+    MAX_HISTORY = 256
+    
     def __init__(self):
         super().__init__()
         self.progress = ConversationProgress()
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=self.MAX_HISTORY)
+        self._loop = None
+        self._cached_requirements = None
+        
+        # Extractor for each state that gathers information from user input
+        self._state_handlers = {
+            ConversationState.BASIC_INFO: self._extract_basic_info,
+            ConversationState.USE_CASE: self._extract_use_case,
+            ConversationState.CHANNELS: self._extract_channels,
+            ConversationState.LANGUAGES: self._extract_languages,
+            ConversationState.PERSONALITY: self._extract_personality,
+            ConversationState.KNOWLEDGE: self._extract_knowledge_sources,
+            ConversationState.INTEGRATIONS: self._extract_integrations,
+        }
         
     async def process_frame(self, frame: Frame, direction: FrameDirection) -> AsyncGenerator[Frame, None]:
         """Process frames to extract requirements information."""
@@ -90,27 +185,19 @@ class RequirementsProcessor(FrameProcessor):
         logger.info(f"Processing user input in state {self.progress.state}: {text}")
         
         # Store conversation history
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
         self.conversation_history.append({
             "state": self.progress.state.value,
             "user_input": text,
-            "timestamp": asyncio.get_event_loop().time()
+            "timestamp": self._loop.time()
         })
         
         # Extract information based on current state
-        if self.progress.state == ConversationState.BASIC_INFO:
-            await self._extract_basic_info(text)
-        elif self.progress.state == ConversationState.USE_CASE:
-            await self._extract_use_case(text)
-        elif self.progress.state == ConversationState.CHANNELS:
-            await self._extract_channels(text)
-        elif self.progress.state == ConversationState.LANGUAGES:
-            await self._extract_languages(text)
-        elif self.progress.state == ConversationState.PERSONALITY:
-            await self._extract_personality(text)
-        elif self.progress.state == ConversationState.KNOWLEDGE:
-            await self._extract_knowledge_sources(text)
-        elif self.progress.state == ConversationState.INTEGRATIONS:
-            await self._extract_integrations(text)
+        self._cached_requirements = None
+        handler = self._state_handlers.get(self.progress.state)
+        if handler:
+            await handler(text)
     
     async def _extract_basic_info(self, text: str):
         """Extract agent name and description."""
@@ -120,19 +207,11 @@ class RequirementsProcessor(FrameProcessor):
         # Try to extract agent name
         if "name" in text_lower or "call" in text_lower:
             # Extract quoted names or names after "call it" or "name it"
-            import re
-            name_patterns = [
-                r'call it ["\']?([^"\']+)["\']?',
-                r'name it ["\']?([^"\']+)["\']?',
-                r'named? ["\']?([^"\']+)["\']?',
-                r'["\']([^"\']+)["\']'
-            ]
-            
-            for pattern in name_patterns:
-                match = re.search(pattern, text_lower)
-                if match:
-                    self.progress.requirements["name"] = match.group(1).strip()
-                    break
+            match = next(
+                (m for m in (p.search(text_lower) for p in _NAME_PATTERNS) if m), None
+            )
+            if match:
+                self.progress.requirements["name"] = match.group(1).strip()
         
         # Use the entire input as description if no specific name found
         if not self.progress.requirements["name"]:
@@ -147,14 +226,7 @@ class RequirementsProcessor(FrameProcessor):
     async def _extract_channels(self, text: str):
         """Extract supported channels."""
         text_lower = text.lower()
-        channels = []
-        
-        if any(word in text_lower for word in ["phone", "call", "telephone", "dial"]):
-            channels.append("phone")
-        if any(word in text_lower for word in ["web", "website", "browser", "online"]):
-            channels.append("web")
-        if any(word in text_lower for word in ["mobile", "app", "ios", "android"]):
-            channels.append("mobile")
+        channels = _CHANNEL_KEYWORDS.find(text_lower)
         
         if not channels:
             # Default based on keywords
@@ -169,24 +241,7 @@ class RequirementsProcessor(FrameProcessor):
         """Extract supported languages."""
         text_lower = text.lower()
         languages = ["en"]  # Default to English
-        
-        language_map = {
-            "spanish": "es",
-            "french": "fr",
-            "german": "de",
-            "italian": "it",
-            "portuguese": "pt",
-            "chinese": "zh",
-            "japanese": "ja",
-            "korean": "ko",
-            "russian": "ru",
-            "arabic": "ar"
-        }
-        
-        for lang_name, lang_code in language_map.items():
-            if lang_name in text_lower:
-                if lang_code not in languages:
-                    languages.append(lang_code)
+        languages.extend(_LANGUAGE_KEYWORDS.find(text_lower))
         
         self.progress.requirements["languages"] = languages
     
@@ -196,14 +251,13 @@ class RequirementsProcessor(FrameProcessor):
     
     async def _extract_knowledge_sources(self, text: str):
         """Extract knowledge source requirements."""
-        text_lower = text.lower()
         sources = []
         
         # Detect different types of knowledge sources
-        if any(word in text_lower for word in ["website", "url", "web", "scrape"]):
+        found = _KNOWLEDGE_SOURCE_KEYWORDS.find(text.lower())
+        if "web" in found:
             # Extract URLs if present
-            import re
-            urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', text)
+            urls = _URL_PATTERN.findall(text)
             for url in urls:
                 sources.append({
                     "type": "web",
@@ -211,14 +265,14 @@ class RequirementsProcessor(FrameProcessor):
                     "processing_options": {}
                 })
         
-        if any(word in text_lower for word in ["faq", "knowledge base", "documentation", "docs"]):
+        if "document" in found:
             sources.append({
                 "type": "document",
                 "source": "faq_database",
                 "processing_options": {"format": "faq"}
             })
         
-        if any(word in text_lower for word in ["api", "database", "system"]):
+        if "api" in found:
             sources.append({
                 "type": "api",
                 "source": "internal_api",
@@ -230,27 +284,18 @@ class RequirementsProcessor(FrameProcessor):
     async def _extract_integrations(self, text: str):
         """Extract integration requirements."""
         text_lower = text.lower()
-        integrations = []
-        
-        integration_keywords = {
-            "twilio": "twilio",
-            "zendesk": "zendesk",
-            "salesforce": "salesforce",
-            "slack": "slack",
-            "teams": "microsoft_teams",
-            "discord": "discord",
-            "whatsapp": "whatsapp",
-            "telegram": "telegram"
-        }
-        
-        for keyword, integration in integration_keywords.items():
-            if keyword in text_lower:
-                integrations.append(integration)
+        integrations = _INTEGRATION_KEYWORDS.find(text_lower)
         
         self.progress.requirements["integrations"] = integrations
     
     def get_current_requirements(self) -> AgentRequirements:
-        """Get current requirements as AgentRequirements object."""
+        """Get current requirements as AgentRequirements object.
+        
+        The result is frozen, so it is reused until the next user input.
+        """
+        if self._cached_requirements is not None:
+            return self._cached_requirements
+        
         req_dict = self.progress.requirements.copy()
         
         # Convert knowledge sources to proper objects
@@ -265,7 +310,10 @@ class RequirementsProcessor(FrameProcessor):
         else:
             req_dict["deployment"] = DeploymentConfig(**req_dict["deployment"])
         
-        return AgentRequirements(**req_dict)
+        # Every field was built above or by the extractors, so skip re-validating
+        # them here; RequirementsValidator checks the result before a build
+        self._cached_requirements = AgentRequirements.model_construct(**req_dict)
+        return self._cached_requirements
 
 
 class ConversationOrchestrator:
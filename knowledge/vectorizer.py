@@ -34,6 +34,11 @@ class DocumentChunk:
 class PipecatDocumentationVectorizer:
     """Vectorizes Pipecat documentation for efficient retrieval."""
     
+    # Query embeddings keyed by (model, query), shared by every instance since
+    # the same provider/role queries recur across builds
+    _query_embeddings: Dict[tuple, List[float]] = {}
+    MAX_CACHED_QUERIES = 1024
+    
     def __init__(self):
         self.embedding_model = SentenceTransformer(settings.embedding_model)
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -48,10 +53,16 @@ class PipecatDocumentationVectorizer:
             settings=ChromaSettings(anonymized_telemetry=False)
         )
         
-        # Create or get collection
+        # Create or get collection. Chroma already indexes it with HNSW; these
+        # graph parameters apply when the collection is first created
         self.collection = self.chroma_client.get_or_create_collection(
             name="pipecat_docs",
-            metadata={"description": "Pipecat documentation knowledge base"}
+            metadata={
+                "description": "Pipecat documentation knowledge base",
+                "hnsw:M": 32,
+                "hnsw:construction_ef": 200,
+                "hnsw:search_ef": 64,
+            }
         )
     
     async def vectorize_documentation(self, docs_path: Optional[str] = None) -> None:
@@ -218,28 +229,53 @@ class PipecatDocumentationVectorizer:
     
     async def search(self, query: str, n_results: int = 5, section_filter: Optional[str] = None) -> List[Dict[str, Any]]:
         """Search the vectorized documentation."""
+        results = await self.search_many([query], n_results=n_results, section_filter=section_filter)
+        return results[0]
+    
+    async def search_many(self, queries: List[str], n_results: int = 5,
+                          section_filter: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """Search for several queries in one batched query; one result list per query."""
         where_clause = {}
         if section_filter:
             where_clause["section"] = section_filter
         
         results = self.collection.query(
-            query_texts=[query],
+            query_embeddings=self._embed_queries(queries),
             n_results=n_results,
             where=where_clause if where_clause else None
         )
         
         # Format results
-        formatted_results = []
-        if results["documents"] and results["documents"][0]:
-            for i, doc in enumerate(results["documents"][0]):
+        all_results = []
+        for q, docs in enumerate(results["documents"] or []):
+            formatted_results = []
+            for i, doc in enumerate(docs or []):
                 formatted_results.append({
                     "content": doc,
-                    "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                    "distance": results["distances"][0][i] if results["distances"] else None,
-                    "id": results["ids"][0][i] if results["ids"] else None
+                    "metadata": results["metadatas"][q][i] if results["metadatas"] else {},
+                    "distance": results["distances"][q][i] if results["distances"] else None,
+                    "id": results["ids"][q][i] if results["ids"] else None
                 })
+            all_results.append(formatted_results)
+        
+        # Pad in case the store returned nothing at all
+        all_results.extend([] for _ in range(len(queries) - len(all_results)))
+        return all_results
+    
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed queries with the document model, encoding only unseen ones."""
+        cache = self._query_embeddings
+        model = settings.embedding_model
+        missing = list(dict.fromkeys(q for q in queries if (model, q) not in cache))
+        fresh = dict(zip(missing, self.embedding_model.encode(missing).tolist())) if missing else {}
+        embeddings = [fresh[q] if q in fresh else cache[(model, q)] for q in queries]
+        
+        for query, embedding in fresh.items():
+            if len(cache) >= self.MAX_CACHED_QUERIES:
+                del cache[next(iter(cache))]  # evict the oldest
+            cache[(model, query)] = embedding
         
-        return formatted_results
+        return embeddings
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the vectorized documentation."""
@@ -6,10 +6,11 @@ An LLM-powered conversational interface for building and deploying Pipecat AI ag
 """
 
 import asyncio
+import hashlib
 import sys
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 import signal
 
 from core.config import settings
@@ -25,6 +26,22 @@ from deployment.pipecat_cloud import PipecatCloudDeployer
 
 logger = setup_logger("main")
 
+# Spaces and hyphens both become underscores in an agent directory name
+_DIR_NAME_TABLE = str.maketrans(' -', '__')
+
+# sha256 of a generated source file -> syntax error message (None if it compiles)
+_COMPILE_CACHE: Dict[bytes, Optional[str]] = {}
+_COMPILE_CACHE_MAX = 256
+
+
+def _compile_error(source: str, filename: str) -> Optional[str]:
+    """Compile source and return the error message, or None if it is valid."""
+    try:
+        compile(source, filename, "exec")
+    except (SyntaxError, ValueError) as e:
+        return str(e)
+    return None
+
 
 class PipecatAgentBuilder:
     """Main application class for building Pipecat agents."""
@@ -355,9 +372,9 @@ class PipecatAgentBuilder:
             "pipeline configuration examples"
         ]
         
+        # One batched query embeds and searches all of them together
         knowledge_context = []
-        for query in queries:
-            results = await self.vectorizer.search(query, n_results=2)
+        for results in await self.vectorizer.search_many(queries, n_results=2):
             knowledge_context.extend(results)
         
         return knowledge_context
@@ -412,14 +429,36 @@ class PipecatAgentBuilder:
                 validation_result["errors"].append(f"Missing required file: {required_file}")
                 validation_result["valid"] = False
         
-        # Validate Python syntax in bot.py
-        if "bot.py" in generated_files:
-            try:
-                import ast
-                ast.parse(generated_files["bot.py"])
-                logger.debug("bot.py syntax validation passed")
-            except SyntaxError as e:
-                validation_result["errors"].append(f"Syntax error in bot.py: {e}")
+        # Validate Python syntax, compiling each distinct source only once
+        python_files = {
+            name: content for name, content in generated_files.items()
+            if name.endswith(".py")
+        }
+        digests = {
+            name: hashlib.sha256(content.encode("utf-8", "surrogatepass")).digest()
+            for name, content in python_files.items()
+        }
+        results: Dict[bytes, Optional[str]] = {}
+        misses: Dict[bytes, str] = {}
+        for name, digest in digests.items():
+            if digest in _COMPILE_CACHE:
+                results[digest] = _COMPILE_CACHE[digest]
+            else:
+                misses.setdefault(digest, name)
+        
+        compile_errors = [_compile_error(python_files[name], name) for name in misses.values()]
+        
+        results.update(zip(misses, compile_errors))
+        if len(_COMPILE_CACHE) + len(misses) > _COMPILE_CACHE_MAX:
+            _COMPILE_CACHE.clear()
+        _COMPILE_CACHE.update(zip(misses, compile_errors))
+        
+        for name, digest in digests.items():
+            error = results[digest]
+            if error is None:
+                logger.debug(f"{name} syntax validation passed")
+            else:
+                validation_result["errors"].append(f"Syntax error in {name}: {error}")
                 validation_result["valid"] = False
         
         # Check for required imports in bot.py
@@ -502,7 +541,7 @@ class PipecatAgentBuilder:
     
     async def _save_generated_files(self, requirements, generated_files) -> Path:
         """Save generated files to disk."""
-        agent_name = requirements.name.lower().replace(' ', '_').replace('-', '_')
+        agent_name = requirements.name.lower().translate(_DIR_NAME_TABLE)
         agent_dir = Path(settings.output_path) / agent_name
         agent_dir.mkdir(parents=True, exist_ok=True)
         
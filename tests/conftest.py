@@ -0,0 +1,56 @@
+"""Shared fixtures for Pipecat Agent Builder tests."""
+
+import pytest
+
+from core.config import AgentRequirements
+import core.validators
+from core.monitoring import MetricsCollector
+
+
+@pytest.fixture(scope="session")
+def base_requirements():
+    """Minimal requirements shared across the test session.
+
+    The model is frozen; tests that need variants should build them with
+    ``base_requirements.model_copy(update=...)``.
+    """
+    return AgentRequirements(
+        name="Test Agent",
+        description="A test agent",
+        use_case="customer_service",
+        channels=["web"],
+        languages=["en"]
+    )
+
+
+@pytest.fixture
+def make_collector():
+    """Build metrics collectors that are closed after the test."""
+    collectors = []
+    
+    def make(**kwargs):
+        collector = MetricsCollector(**kwargs)
+        collectors.append(collector)
+        return collector
+    
+    yield make
+    for collector in collectors:
+        collector.close()
+
+
+def _cached_callables(namespace):
+    """Yield functools caches found in a module or class namespace."""
+    for attr in vars(namespace).values():
+        func = getattr(attr, "__func__", attr)  # unwrap classmethod/staticmethod
+        if hasattr(func, "cache_clear"):
+            yield func
+        elif isinstance(attr, type) and attr.__module__ == namespace.__name__:
+            yield from _cached_callables(attr)
+
+
+@pytest.fixture(autouse=True)
+def _clear_validator_caches():
+    """Start every test with empty validator lru caches."""
+    for cached in _cached_callables(core.validators):
+        cached.cache_clear()
+    yield
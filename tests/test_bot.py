@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Test the voice bot's analyzer pool."""
+
+import pytest
+from unittest.mock import Mock
+
+import bot
+
+
+@pytest.fixture
+def idle_analyzers(monkeypatch):
+    """Empty analyzer pool for the test."""
+    pool = []
+    monkeypatch.setattr(bot, "_idle_analyzers", pool)
+    return pool
+
+
+class TestAnalyzerPool:
+    """Test analyzer pairs are reset before they are reused."""
+    
+    def test_release_clears_session_state(self, idle_analyzers):
+        """Test a released pair is cleared and handed to the next session."""
+        vad_analyzer, turn_analyzer = Mock(), Mock()
+        vad_analyzer._vad_buffer = b"\x01\x00" * 100
+        vad_analyzer._prev_volume = 0.8
+        
+        bot._release_analyzers(vad_analyzer, turn_analyzer)
+        
+        assert bot._acquire_analyzers() == (vad_analyzer, turn_analyzer)
+        assert not idle_analyzers
+        turn_analyzer.clear.assert_called_once()
+        assert vad_analyzer._vad_buffer == b""
+        assert vad_analyzer._prev_volume == 0
+        vad_analyzer.set_params.assert_called_once_with(vad_analyzer.params)
+        vad_analyzer._model.reset_states.assert_called_once()
+    
+    def test_pooled_silero_vad_comes_back_clean(self, idle_analyzers):
+        """Test a Silero VAD released mid-utterance is quiet and empty on reuse."""
+        silero = pytest.importorskip("pipecat.audio.vad.silero")
+        from pipecat.audio.vad.vad_analyzer import VADState
+        
+        vad_analyzer, turn_analyzer = silero.SileroVADAnalyzer(), Mock()
+        vad_analyzer.set_sample_rate(16000)
+        # Less than one VAD frame, so it stays buffered
+        vad_analyzer.analyze_audio(b"\x01\x00" * 100)
+        vad_analyzer._vad_state = VADState.SPEAKING
+        assert vad_analyzer._vad_buffer
+        
+        bot._release_analyzers(vad_analyzer, turn_analyzer)
+        vad_analyzer, turn_analyzer = bot._acquire_analyzers()
+        
+        assert vad_analyzer._vad_buffer == b""
+        assert vad_analyzer._vad_state == VADState.QUIET
+        turn_analyzer.clear.assert_called_once()
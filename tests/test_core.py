@@ -2,147 +2,152 @@
 """Core component tests for Pipecat Agent Builder."""
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.config import AgentRequirements, AIServiceConfig, DeploymentConfig, KnowledgeSourceConfig
+from pydantic import ValidationError as PydanticValidationError
 from core.exceptions import *
 from core.validators import SecurityValidator, RequirementsValidator, ResourceValidator
-from core.monitoring import MetricsCollector
+
+from validation_cases import (
+    VALID_AGENT_NAMES, INVALID_AGENT_NAMES,
+    VALID_URLS, INVALID_URLS,
+    VALID_FILE_PATHS, INVALID_FILE_PATHS,
+)
+
+# Built once; more sources than ResourceValidator.MAX_KNOWLEDGE_SOURCES allows
+_MANY_KNOWLEDGE_SOURCES = tuple(
+    KnowledgeSourceConfig(type="web", source=f"https://example{i}.com")
+    for i in range(15)
+)
 
 
 class TestSecurityValidator:
     """Test security validation functionality."""
     
-    def test_validate_agent_name_valid(self):
+    @pytest.mark.parametrize("name", VALID_AGENT_NAMES)
+    def test_validate_agent_name_valid(self, name):
         """Test valid agent names."""
-        valid_names = [
-            "Customer Service Bot",
-            "Personal-Assistant",
-            "AI_Helper_2024",
-            "Simple Bot"
-        ]
-        
-        for name in valid_names:
-            result = SecurityValidator.validate_agent_name(name)
-            assert result == name.strip()
+        assert SecurityValidator.validate_agent_name(name) == name.strip()
     
-    def test_validate_agent_name_invalid(self):
+    @pytest.mark.parametrize("name", INVALID_AGENT_NAMES, ids=repr)
+    def test_validate_agent_name_invalid(self, name):
         """Test invalid agent names."""
-        invalid_names = [
-            "",
-            "   ",
-            "Bot with __import__ code",
-            "eval('malicious')",
-            "x" * 101,  # Too long
-        ]
-        
-        for name in invalid_names:
-            with pytest.raises(ValidationError):
-                SecurityValidator.validate_agent_name(name)
+        with pytest.raises(ValidationError):
+            SecurityValidator.validate_agent_name(name)
     
-    def test_validate_url_valid(self):
+    @pytest.mark.parametrize("pattern", SecurityValidator.DANGEROUS_PATTERNS)
+    def test_name_scan_skips_only_unreachable_patterns(self, pattern):
+        """Test name scanning omits only patterns a safe name cannot contain."""
+        if r'\(' in pattern:
+            assert not SecurityValidator.SAFE_NAME_PATTERN.match("(")
+        else:
+            assert pattern in SecurityValidator._NAME_DANGEROUS_RE.pattern.split('|')
+    
+    @pytest.mark.parametrize("url", VALID_URLS)
+    def test_validate_url_valid(self, url):
         """Test valid URLs."""
-        valid_urls = [
-            "https://docs.example.com",
-            "http://api.service.com/v1",
-            "https://knowledge.company.org/faq"
-        ]
-        
-        for url in valid_urls:
-            result = SecurityValidator.validate_url(url)
-            assert result == url
+        assert SecurityValidator.validate_url(url) == url
     
-    def test_validate_url_invalid(self):
+    @pytest.mark.parametrize("url", INVALID_URLS, ids=repr)
+    def test_validate_url_invalid(self, url):
         """Test invalid URLs."""
-        invalid_urls = [
-            "ftp://file.server.com",
-            "http://localhost:8080",
-            "https://192.168.1.1",
-            "not-a-url",
-            ""
-        ]
-        
-        for url in invalid_urls:
-            with pytest.raises(ValidationError):
-                SecurityValidator.validate_url(url)
+        with pytest.raises(ValidationError):
+            SecurityValidator.validate_url(url)
+    
+    @pytest.mark.parametrize("path", VALID_FILE_PATHS)
+    def test_validate_file_path_valid(self, path):
+        """Test valid file paths."""
+        assert SecurityValidator.validate_file_path(path) == path
+    
+    @pytest.mark.parametrize("path", INVALID_FILE_PATHS, ids=repr)
+    def test_validate_file_path_invalid(self, path):
+        """Test invalid file paths."""
+        with pytest.raises(ValidationError):
+            SecurityValidator.validate_file_path(path)
 
 
 class TestRequirementsValidator:
     """Test requirements validation."""
     
-    def test_validate_requirements_valid(self):
+    def test_validate_requirements_valid(self, base_requirements):
         """Test valid requirements."""
-        requirements = AgentRequirements(
-            name="Test Agent",
-            description="A test agent for validation",
-            use_case="customer_service",
-            channels=["web", "phone"],
-            languages=["en", "es"],
-            knowledge_sources=[
+        requirements = base_requirements.model_copy(update={
+            "description": "A test agent for validation",
+            "channels": ["web", "phone"],
+            "languages": ["en", "es"],
+            "knowledge_sources": [
                 KnowledgeSourceConfig(
                     type="web",
                     source="https://docs.example.com"
                 )
             ],
-            integrations=["twilio", "zendesk"]
-        )
+            "integrations": ["twilio", "zendesk"]
+        })
         
         validated = RequirementsValidator.validate_requirements(requirements)
         assert validated.name == "Test Agent"
         assert "web" in validated.channels
         assert "en" in validated.languages
     
-    def test_validate_requirements_invalid_channels(self):
+    def test_validate_requirements_invalid_channels(self, base_requirements):
         """Test invalid channels."""
-        requirements = AgentRequirements(
-            name="Test Agent",
-            description="A test agent",
-            use_case="customer_service",
-            channels=["invalid_channel"],
-            languages=["en"]
-        )
+        requirements = base_requirements.model_copy(update={"channels": ["invalid_channel"]})
+        
+        with pytest.raises(ValidationError):
+            RequirementsValidator.validate_requirements(requirements)
+    
+    def test_validate_requirements_invalid_languages(self, base_requirements):
+        """Test invalid languages."""
+        requirements = base_requirements.model_copy(update={"languages": ["invalid_lang"]})
         
         with pytest.raises(ValidationError):
             RequirementsValidator.validate_requirements(requirements)
+    
+    def test_validate_requirements_returns_copy(self, base_requirements):
+        """Test defaults are applied to a copy of the frozen requirements."""
+        requirements = base_requirements.model_copy(update={"channels": []})
+        
+        validated = RequirementsValidator.validate_requirements(requirements)
+        assert validated.channels == ["web"]
+        assert requirements.channels == []
+        with pytest.raises(PydanticValidationError):
+            requirements.channels = ["web"]
 
 
 class TestResourceValidator:
     """Test resource validation and estimation."""
     
-    def test_validate_resource_limits_valid(self):
+    def test_validate_resource_limits_valid(self, base_requirements):
         """Test valid resource limits."""
-        requirements = AgentRequirements(
-            name="Test Agent",
-            description="A test agent",
-            use_case="customer_service",
-            channels=["web"],
-            languages=["en"],
-            knowledge_sources=[
+        requirements = base_requirements.model_copy(update={
+            "knowledge_sources": [
                 KnowledgeSourceConfig(type="web", source="https://example.com")
             ],
-            integrations=["twilio"]
-        )
+            "integrations": ["twilio"]
+        })
         
         # Should not raise exception
         ResourceValidator.validate_resource_limits(requirements)
     
-    def test_estimate_resource_usage(self):
+    def test_validate_resource_limits_too_many_sources(self, base_requirements):
+        """Test too many knowledge sources."""
+        knowledge_sources = list(_MANY_KNOWLEDGE_SOURCES)
+        
+        requirements = base_requirements.model_copy(update={"knowledge_sources": knowledge_sources})
+        
+        with pytest.raises(ValidationError):
+            ResourceValidator.validate_resource_limits(requirements)
+    
+    def test_estimate_resource_usage(self, base_requirements):
         """Test resource usage estimation."""
-        requirements = AgentRequirements(
-            name="Test Agent",
-            description="A test agent",
-            use_case="customer_service",
-            channels=["web", "phone"],
-            languages=["en", "es"],
-            knowledge_sources=[
+        requirements = base_requirements.model_copy(update={
+            "channels": ["web", "phone"],
+            "languages": ["en", "es"],
+            "knowledge_sources": [
                 KnowledgeSourceConfig(type="web", source="https://example.com")
             ],
-            integrations=["twilio"]
-        )
+            "integrations": ["twilio"]
+        })
         
         estimate = ResourceValidator.estimate_resource_usage(requirements)
         
@@ -158,11 +163,12 @@ class TestResourceValidator:
 class TestMetricsCollector:
     """Test metrics collection functionality."""
     
-    def test_record_metric(self):
+    def test_record_metric(self, make_collector):
         """Test metric recording."""
-        collector = MetricsCollector()
+        collector = make_collector()
         
         collector.record_metric("test_metric", 42.0, {"label": "test"})
+        collector.flush()
         
         assert "test_metric" in collector.metrics
         assert len(collector.metrics["test_metric"]) == 1
@@ -171,23 +177,47 @@ class TestMetricsCollector:
         assert point.value == 42.0
         assert point.labels["label"] == "test"
     
-    def test_increment_counter(self):
+    def test_increment_counter(self, make_collector):
         """Test counter increment."""
-        collector = MetricsCollector()
+        collector = make_collector()
         
         collector.increment_counter("test_counter")
         collector.increment_counter("test_counter")
+        collector.flush()
         
-        # Should have recorded two metric points
-        assert len(collector.metrics["test_counter"]) == 2
+        # Increments are coalesced into one point per flush
+        assert len(collector.metrics["test_counter"]) == 1
         
-        # Values should be 1 and 2
         values = [p.value for p in collector.metrics["test_counter"]]
-        assert values == [1, 2]
+        assert values == [2]
+        assert collector.counters[("test_counter", ())] == 2
+    
+    def test_counter_batch_counts_amount(self, make_collector):
+        """Test a large increment fills the coalescing batch on its own."""
+        collector = make_collector(counter_batch_size=10)
+        
+        collector.increment_counter("bytes", amount=10)
+        collector.increment_counter("bytes")
+        collector.flush()
+        
+        values = [p.value for p in collector.metrics["bytes"]]
+        assert values == [10, 11]
     
-    def test_session_tracking(self):
+    def test_counter_labels_order_independent(self, make_collector):
+        """Test counters with the same labels share one key regardless of order."""
+        collector = make_collector()
+        
+        collector.increment_counter("requests", {"method": "GET", "status": "200"})
+        collector.increment_counter("requests", {"status": "200", "method": "GET"})
+        
+        exported = collector.export_metrics()["counters"]
+        assert exported == [
+            {"name": "requests", "labels": {"method": "GET", "status": "200"}, "value": 2}
+        ]
+    
+    def test_session_tracking(self, make_collector):
         """Test build session tracking."""
-        collector = MetricsCollector()
+        collector = make_collector()
         
         session = collector.start_session("test-session", "Test Agent", "customer_service")
         
@@ -200,6 +230,103 @@ class TestMetricsCollector:
         
         assert session.status == "completed"
         assert session.end_time is not None
+    
+    def test_session_stats(self, make_collector):
+        """Test session statistics."""
+        collector = make_collector()
+        
+        # Create some test sessions
+        collector.start_session("session1", "Agent1", "customer_service")
+        collector.end_session("session1", "completed")
+        
+        collector.start_session("session2", "Agent2", "education")
+        collector.end_session("session2", "failed", "Test error")
+        
+        stats = collector.get_session_stats()
+        
+        assert stats["total_sessions"] == 2
+        assert stats["completed_sessions"] == 1
+        assert stats["failed_sessions"] == 1
+        assert stats["success_rate"] == 0.5
+    
+    def test_session_stats_when_session_restarted(self, make_collector):
+        """Test restarting a session id drops its earlier outcome from the stats."""
+        collector = make_collector()
+        
+        collector.start_session("session1")
+        collector.end_session("session1", "completed")
+        collector.start_session("session2")
+        collector.end_session("session2", "failed", "Test error")
+        collector.start_session("session1")
+        
+        stats = collector.get_session_stats()
+        
+        assert stats["total_sessions"] == 2
+        assert stats["completed_sessions"] == 0
+        assert stats["failed_sessions"] == 1
+        assert stats["success_rate"] == 0
+    
+    def test_session_stats_when_session_ended_twice(self, make_collector):
+        """Test a re-ended session is only counted under its final status."""
+        collector = make_collector()
+        
+        collector.start_session("session1")
+        collector.end_session("session1", "completed")
+        collector.end_session("session1", "failed", "Late error")
+        
+        stats = collector.get_session_stats()
+        
+        assert stats["total_sessions"] == 1
+        assert stats["completed_sessions"] == 0
+        assert stats["failed_sessions"] == 1
+        assert stats["average_duration"] == 0
+    
+    def test_session_eviction_keeps_in_progress(self, make_collector):
+        """Test only finished sessions are evicted once over capacity."""
+        collector = make_collector(max_sessions=2)
+        
+        collector.start_session("active")
+        collector.start_session("done")
+        collector.end_session("done", "completed")
+        collector.start_session("new")
+        
+        assert list(collector.sessions) == ["active", "new"]
+        stats = collector.get_session_stats()
+        assert stats["total_sessions"] == 2
+        assert stats["completed_sessions"] == 0
+    
+    def test_record_metric_rejects_non_numeric(self, make_collector):
+        """Test a non-numeric value fails at the caller without losing other points."""
+        collector = make_collector()
+        
+        collector.record_metric("other_metric", 3.0)
+        with pytest.raises(ValueError):
+            collector.record_metric("bad_metric", "oops")
+        collector.flush()
+        
+        assert [p.value for p in collector.metrics["other_metric"]] == [3.0]
+        assert "bad_metric" not in collector.metrics
+    
+    def test_flush_survives_failed_batch(self, make_collector):
+        """Test a batch that fails to apply does not block later flushes."""
+        collector = make_collector()
+        
+        collector._enqueue("bad_metric", "not a number", ())
+        collector.flush()
+        collector.record_metric("good_metric", 1.0)
+        collector.flush()
+        
+        assert len(collector.metrics["good_metric"]) == 1
+    
+    def test_close_stops_worker(self, make_collector):
+        """Test close applies queued points and stops the worker thread."""
+        collector = make_collector()
+        
+        collector.record_metric("test_metric", 1.0)
+        collector.close()
+        
+        assert not collector._worker.is_alive()
+        assert len(collector.metrics["test_metric"]) == 1
 
 
 if __name__ == "__main__":
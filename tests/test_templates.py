@@ -2,23 +2,22 @@
 """Test template generation functionality."""
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.config import AgentRequirements, AIServiceConfig
 from generation.templates import PipecatTemplateGenerator
 
 
+@pytest.fixture(scope="module")
+def generator():
+    """Template generator shared by the tests in this module."""
+    return PipecatTemplateGenerator()
+
+
 class TestTemplateGeneration:
     """Test code template generation."""
     
-    def test_generate_basic_agent_files(self):
+    def test_generate_basic_agent_files(self, generator):
         """Test basic agent file generation."""
-        generator = PipecatTemplateGenerator()
-        
         requirements = AgentRequirements(
             name="Test Agent",
             description="A test agent",
@@ -45,10 +44,8 @@ class TestTemplateGeneration:
         assert "OpenAILLMService" in bot_content
         assert "CartesiaTTSService" in bot_content
     
-    def test_generate_phone_agent(self):
+    def test_generate_phone_agent(self, generator):
         """Test phone agent generation."""
-        generator = PipecatTemplateGenerator()
-        
         requirements = AgentRequirements(
             name="Phone Agent",
             description="Handles phone calls",
@@ -63,10 +60,8 @@ class TestTemplateGeneration:
         # Should use Daily transport for phone
         assert "DailyParams" in bot_content or "daily" in bot_content.lower()
     
-    def test_generate_multilingual_agent(self):
+    def test_generate_multilingual_agent(self, generator):
         """Test multilingual agent generation."""
-        generator = PipecatTemplateGenerator()
-        
         requirements = AgentRequirements(
             name="Multilingual Agent",
             description="Supports multiple languages",
@@ -82,10 +77,8 @@ class TestTemplateGeneration:
         assert len(requirements.languages) > 1
         assert "languages" in bot_content.lower() or "multilingual" in bot_content.lower()
     
-    def test_generate_with_knowledge_sources(self):
+    def test_generate_with_knowledge_sources(self, generator):
         """Test agent with knowledge sources."""
-        generator = PipecatTemplateGenerator()
-        
         requirements = AgentRequirements(
             name="Knowledge Agent",
             description="Has knowledge sources",
@@ -109,10 +102,8 @@ class TestTemplateGeneration:
         assert "knowledge_processor" in bot_content.lower()
         assert "KnowledgeProcessor" in knowledge_content
     
-    def test_dockerfile_generation(self):
+    def test_dockerfile_generation(self, generator):
         """Test Dockerfile generation."""
-        generator = PipecatTemplateGenerator()
-        
         requirements = AgentRequirements(
             name="Docker Test Agent",
             description="Test Dockerfile generation",
@@ -130,10 +121,8 @@ class TestTemplateGeneration:
         assert "pip install" in dockerfile
         assert "CMD" in dockerfile
     
-    def test_requirements_txt_generation(self):
+    def test_requirements_txt_generation(self, generator):
         """Test requirements.txt generation."""
-        generator = PipecatTemplateGenerator()
-        
         requirements = AgentRequirements(
             name="Requirements Test Agent",
             description="Test requirements.txt generation",
@@ -154,10 +143,8 @@ class TestTemplateGeneration:
         assert "openai" in req_content.lower()
         assert "cartesia" in req_content.lower()
     
-    def test_deployment_config_generation(self):
+    def test_deployment_config_generation(self, generator):
         """Test deployment configuration generation."""
-        generator = PipecatTemplateGenerator()
-        
         requirements = AgentRequirements(
             name="Deploy Test Agent",
             description="Test deployment config",
@@ -0,0 +1,53 @@
+"""Shared input cases for SecurityValidator tests."""
+
+_OVERLONG_NAME = "x" * 101  # One past the 100 character limit
+
+VALID_AGENT_NAMES = [
+    "Customer Service Bot",
+    "Personal-Assistant",
+    "AI_Helper_2024",
+    "Simple Bot",
+]
+
+INVALID_AGENT_NAMES = [
+    "",
+    "   ",
+    "Bot with __import__ code",
+    "Getattr Helper",
+    "eval('malicious')",
+    _OVERLONG_NAME,
+    "Bot<script>alert(1)</script>",
+]
+
+VALID_URLS = [
+    "https://docs.example.com",
+    "http://api.service.com/v1",
+    "https://knowledge.company.org/faq",
+    "https://172.217.0.1/search",  # Public, despite the 172. prefix
+]
+
+INVALID_URLS = [
+    "ftp://file.server.com",
+    "javascript:alert(1)",
+    "http://localhost:8080",
+    "https://192.168.1.1",
+    "https://10.0.0.5",
+    "https://172.16.0.1",
+    "http://[::1]:8000",
+    "http://0.0.0.0",
+    "not-a-url",
+    "",
+]
+
+VALID_FILE_PATHS = [
+    "documents/faq.pdf",
+    "knowledge/manual.txt",
+    "data.json",
+]
+
+INVALID_FILE_PATHS = [
+    "../../../etc/passwd",
+    "/etc/shadow",
+    "../../config.ini",
+    "/usr/bin/malicious",
+]